@@ -2,11 +2,12 @@
 # Copyright 2020 Silicon Compiler Authors. All Rights Reserved.
 
 import os
-import siliconcompiler
 
 
 def main():
     '''Simple asicflow example.'''
+    import siliconcompiler
+
     root = os.path.dirname(__file__)
 
     chip = siliconcompiler.Chip('gcd')
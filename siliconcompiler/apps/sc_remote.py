@@ -145,8 +145,9 @@ To delete a job, use:
         entry_nodes = chip._get_flowgraph_entry_nodes(chip.get('option', 'flow'))
         flow = chip.get('option', 'flow')
         entry_nodes = chip._get_flowgraph_entry_nodes(flow)
+        flowgraph_outputs = chip._get_flowgraph_outputs(flow)
         for entry_node in entry_nodes:
-            outputs = chip._get_flowgraph_node_outputs(flow, entry_node)
+            outputs = flowgraph_outputs.get(entry_node, [])
             chip.set('option', 'from', list(map(lambda node: node[0], outputs)))
         # Enter the remote run loop.
         chip._init_logger(step='remote', index='0', in_run=True)
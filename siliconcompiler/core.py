@@ -2,9 +2,10 @@
 
 import time
 import multiprocessing
+import multiprocessing.connection
+import concurrent.futures
 import tarfile
 import os
-import git
 import pathlib
 import sys
 import gzip
@@ -18,8 +19,8 @@ import importlib
 import inspect
 import textwrap
 import math
+import mmap
 import pkgutil
-import graphviz
 import shlex
 import platform
 import getpass
@@ -30,9 +31,15 @@ import tempfile
 import packaging.version
 import packaging.specifiers
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
 from siliconcompiler.remote import client
 from siliconcompiler.schema import Schema, SCHEMA_VERSION
+from siliconcompiler.schema.utils import (
+    _ENV_VAR_RE,
+    _JSON_MANIFEST_RE,
+    _YAML_MANIFEST_RE,
+    _TCL_MANIFEST_RE,
+    _CSV_MANIFEST_RE
+)
 from siliconcompiler import scheduler
 from siliconcompiler import utils
 from siliconcompiler import units
@@ -47,6 +54,32 @@ from siliconcompiler import sc_open
 import psutil
 import subprocess
 import glob
+import functools
+
+# Characters that os.path.expandvars() acts on ($VAR, plus %VAR% on Windows)
+_ENV_VAR_CHARS = ('$', '%') if os.name == 'nt' else ('$',)
+
+
+@functools.lru_cache(maxsize=4096)
+def _imported_filename(pathstr, package):
+    # Pure mapping, so repeated lookups of the same path skip the hashing
+    path = pathlib.PurePosixPath(pathstr)
+    ext = ''.join(path.suffixes)
+
+    # strip off all file suffixes to get just the bare name
+    barepath = path
+    while barepath.suffix:
+        barepath = pathlib.PurePosixPath(barepath.stem)
+    filename = str(barepath.parts[-1])
+
+    if not package:
+        package = ''
+    else:
+        package = f'{package}:'
+    path_to_hash = f'{package}{str(path)}'
+    pathhash = hashlib.sha1(path_to_hash.encode('utf-8')).hexdigest()
+
+    return f'{filename}_{pathhash}{ext}'
 
 
 class Chip:
@@ -576,7 +609,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if 'package' not in cfg or 'source' not in cfg['package']:
             return
 
-        schema = Schema(cfg=cfg)
+        # Only the package sources are needed, so avoid copying and
+        # validating the rest of the imported configuration
+        schema = Schema(cfg={'package': cfg['package']})
 
         for source in schema.getkeys('package', 'source'):
             if not schema.valid('package', 'source', source, 'path'):
@@ -729,11 +764,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             Returns the name of the foundry from the PDK.
 
         """
-        self.logger.debug(f"Reading from {keypath}. Field = '{field}'")
+        self.logger.debug("Reading from %s. Field = '%s'", keypath, field)
 
         try:
-            strict = self.schema.get('option', 'strict')
-            if field == 'value' and strict:
+            if field == 'value' and self.schema.get('option', 'strict'):
                 pernode = self.schema.get(*keypath, field='pernode')
                 if pernode == 'optional' and (step is None or index is None):
                     self.error(
@@ -771,7 +805,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             Returns all keys for the 'pdk' keypath.
         """
         if len(keypath) > 0:
-            self.logger.debug(f'Getting schema parameter keys for {keypath}')
+            self.logger.debug('Getting schema parameter keys for %s', keypath)
         else:
             self.logger.debug('Getting all schema parameter keys.')
 
@@ -810,7 +844,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             >>> pdk = chip.getdict('pdk')
             Returns the complete dictionary found for the keypath 'pdk'
         """
-        self.logger.debug(f'Getting cfg for: {keypath}')
+        self.logger.debug('Getting cfg for: %s', keypath)
 
         try:
             return self.schema.getdict(*keypath)
@@ -820,7 +854,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
     ###########################################################################
     def __add_set_package(self, keypath, value, package, step, index, clobber, add):
-        sc_type = self.get(*keypath, field='type')
+        # The keypath was validated by the caller, so the type can be read
+        # directly from the schema
+        sc_type = self.schema.get(*keypath, field='type')
         if 'file' in sc_type or 'dir' in sc_type:
             value_list = isinstance(value, (list, tuple))
             package_list = isinstance(package, (list, tuple))
@@ -871,7 +907,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         '''
         keypath = args[:-1]
         value = args[-1]
-        self.logger.debug(f'Setting {keypath} to {value}')
+        self.logger.debug('Setting %s to %s', keypath, value)
 
         # Special case to ensure loglevel is updated ASAP
         if keypath == ['option', 'loglevel'] and field == 'value' and \
@@ -913,10 +949,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             index (str): Index name to unset for parameters that may be specified
                 on a per-node basis.
         '''
-        self.logger.debug(f'Unsetting {keypath}')
+        self.logger.debug('Unsetting %s', keypath)
 
         if not self.schema.unset(*keypath, step=step, index=index):
-            self.logger.debug(f'Failed to unset value for {keypath}: parameter is locked')
+            self.logger.debug('Failed to unset value for %s: parameter is locked', keypath)
 
     ###########################################################################
     def add(self, *args, field='value', step=None, index=None, package=None):
@@ -950,7 +986,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         '''
         keypath = args[:-1]
         value = args[-1]
-        self.logger.debug(f'Appending value {value} to {keypath}')
+        self.logger.debug('Appending value %s to %s', value, keypath)
 
         try:
             value_success = self.schema.add(*args, field=field, step=step, index=index)
@@ -1078,7 +1114,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             search_paths = [self.cwd]
 
         searchdirs = ', '.join([str(p) for p in search_paths])
-        self.logger.debug(f"Searching for file {filename} in {searchdirs}")
+        self.logger.debug("Searching for file %s in %s", filename, searchdirs)
 
         result = None
         for searchdir in search_paths:
@@ -1172,7 +1208,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             self.error('Can only call find_files on file or dir types')
             return None
 
-        is_list = bool(re.match(r'\[', paramtype))
+        is_list = paramtype.startswith('[')
 
         paths = self.schema.get(*keypath, job=job, step=step, index=index)
         dependencies = self.schema.get(*keypath, job=job,
@@ -1271,6 +1307,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if not path:
             return None
 
+        if not os.path.isdir(collected_dir):
+            # Nothing has been imported yet
+            return None
+
         path_paths = pathlib.PurePosixPath(path).parts
         for n in range(len(path_paths)):
             # Search through the path elements to see if any of the previous path parts
@@ -1334,8 +1374,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         relative paths resolved where required.
         '''
         schema = self.schema.copy()
-        for keypath in self.allkeys():
-            paramtype = self.get(*keypath, field='type')
+        for keypath, leaf in self.schema._allleaves():
+            paramtype = leaf['type']
             if not ('file' in paramtype or 'dir' in paramtype):
                 # only do something if type is file or dir
                 continue
@@ -1402,7 +1442,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                     self.logger.warning(f'Keypath {keylist} is not valid')
             if key_valid and 'default' not in keylist:
                 typestr = src.get(*keylist, field='type')
-                should_append = re.match(r'\[', typestr) and not clear
+                should_append = typestr.startswith('[') and not clear
                 for val, step, index in src._getvals(*keylist, return_defvalue=False):
                     # update value, handling scalars vs. lists
                     if should_append:
@@ -1442,10 +1482,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             True if all file paths are valid, otherwise False.
         '''
 
-        allkeys = self.allkeys()
         error = False
-        for keypath in allkeys:
-            paramtype = self.get(*keypath, field='type')
+        for keypath, leaf in self.schema._allleaves():
+            keypath = list(keypath)
+            paramtype = leaf['type']
             is_file = 'file' in paramtype
             is_dir = 'dir' in paramtype
             is_list = paramtype.startswith('[')
@@ -1567,10 +1607,13 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             self.logger.error(f"flowgraph {flow} not defined.")
 
         nodes_to_execute = self.nodes_to_execute()
+        pruned_flowgraph_nodes = self._get_pruned_flowgraph_nodes(flow,
+                                                                  self.get('option', 'prune'))
         for (step, index) in nodes_to_execute:
             in_job = self._get_in_job(step, index)
 
-            for in_step, in_index in self._get_pruned_node_inputs(flow, (step, index)):
+            for in_step, in_index in self._get_pruned_node_inputs(flow, (step, index),
+                                                                  pruned_flowgraph_nodes):
                 if in_job != self.get('option', 'jobname'):
                     workdir = self._getworkdir(jobname=in_job, step=in_step, index=in_index)
                     cfg = os.path.join(workdir, 'outputs', f'{design}.pkg.json')
@@ -1613,12 +1656,11 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 self.logger.error(f"Target library {library} not found.")
 
         # 3. Check requirements list
-        allkeys = self.allkeys()
-        for key in allkeys:
+        for key, leaf in self.schema._allleaves():
             keypath = ",".join(key)
             if 'default' not in key and 'history' not in key and 'library' not in key:
                 key_empty = self.schema._is_empty(*key)
-                requirement = self.get(*key, field='require')
+                requirement = leaf['require']
                 if key_empty and (str(requirement) == 'all'):
                     error = True
                     self.logger.error(f"Global requirement missing for [{keypath}].")
@@ -1898,14 +1940,17 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         # resolve absolute paths
         if abspath:
             schema = self._abspath()
+            if prune:
+                self.logger.debug('Pruning dictionary before writing file %s', filepath)
+                schema.prune()
+        elif prune:
+            self.logger.debug('Pruning dictionary before writing file %s', filepath)
+            schema = self.schema._copy_pruned()
         else:
             schema = self.schema.copy()
 
-        if prune:
-            self.logger.debug('Pruning dictionary before writing file %s', filepath)
-            schema.prune()
-
-        is_csv = re.search(r'(\.csv)(\.gz)*$', filepath)
+        # Manifest extensions are matched case-sensitively when writing
+        is_csv = _CSV_MANIFEST_RE.search(filepath)
 
         # format specific dumping
         if filepath.endswith('.gz'):
@@ -1919,14 +1964,15 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         # format specific printing
         try:
-            if re.search(r'(\.json|\.sup)(\.gz)*$', filepath):
+            if _JSON_MANIFEST_RE.search(filepath):
                 schema.write_json(fout)
-            elif re.search(r'(\.yaml|\.yml)(\.gz)*$', filepath):
+            elif _YAML_MANIFEST_RE.search(filepath):
                 schema.write_yaml(fout)
-            elif re.search(r'(\.tcl)(\.gz)*$', filepath):
+            elif _TCL_MANIFEST_RE.search(filepath):
                 # TCL only gets values associated with the current node.
                 step = self.get('arg', 'step')
                 index = self.get('arg', 'index')
+                from jinja2 import Environment, FileSystemLoader
                 tcl_template = Environment(
                     loader=FileSystemLoader(
                         os.path.join(self.scroot,
@@ -2068,7 +2114,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         else:
             cfg = self.schema.cfg['library']
 
-        newlib = copy.deepcopy(libcfg)
+        newlib = Schema._copy_cfg(libcfg)
 
         if 'library' in newlib:
             for sublib_name, sublibcfg in newlib['library'].items():
@@ -2140,6 +2186,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         else:
             rankdir = 'TB'
 
+        import graphviz
         dot = graphviz.Digraph(format=fileformat)
         dot.graph_attr['rankdir'] = rankdir
         dot.attr(bgcolor='transparent')
@@ -2204,8 +2251,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 # skip history
                 continue
             leaftype = self.get(*key, field='type')
-            is_dir = re.search('dir', leaftype)
-            is_file = re.search('file', leaftype)
+            is_dir = 'dir' in leaftype
+            is_file = 'file' in leaftype
             if is_dir or is_file:
                 copy = self.get(*key, field='copy')
                 if copyall or copy:
@@ -2227,37 +2274,51 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                             else:
                                 files[(package, path)] = abspath
 
-        for package, path in sorted(dirs.keys()):
-            posix_path = self.__convert_paths_to_posix([path])[0]
-            if self._find_sc_imported_file(posix_path, package, directory):
-                # File already imported in directory
-                continue
+        # Copies are I/O bound and release the GIL, so overlap them
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            copies = []
+
+            def copy_file(src, dst):
+                copies.append(executor.submit(shutil.copy2, src, dst))
 
-            abspath = dirs[(package, path)]
-            if abspath:
-                filename = self._get_imported_filename(posix_path, package)
-                dst_path = os.path.join(directory, filename)
-                if os.path.exists(dst_path):
+            for package, path in sorted(dirs.keys()):
+                posix_path = self.__convert_paths_to_posix([path])[0]
+                if self._find_sc_imported_file(posix_path, package, directory):
+                    # File already imported in directory
                     continue
-                self.logger.info(f"Copying directory {abspath} to '{directory}' directory")
-                shutil.copytree(abspath, dst_path)
-            else:
-                self.error(f'Failed to copy {path}', fatal=True)
 
-        for package, path in sorted(files.keys()):
-            posix_path = self.__convert_paths_to_posix([path])[0]
-            if self._find_sc_imported_file(posix_path, package, directory):
-                # File already imported in directory
-                continue
+                abspath = dirs[(package, path)]
+                if abspath:
+                    filename = self._get_imported_filename(posix_path, package)
+                    dst_path = os.path.join(directory, filename)
+                    if os.path.exists(dst_path):
+                        continue
+                    self.logger.info(f"Copying directory {abspath} to '{directory}' directory")
+                    shutil.copytree(abspath, dst_path, copy_function=copy_file)
+                else:
+                    self.error(f'Failed to copy {path}', fatal=True)
 
-            abspath = files[(package, path)]
-            if abspath:
-                filename = self._get_imported_filename(posix_path, package)
-                dst_path = os.path.join(directory, filename)
-                self.logger.info(f"Copying {abspath} to '{directory}' directory")
-                shutil.copy(abspath, dst_path)
-            else:
-                self.error(f'Failed to copy {path}', fatal=True)
+            # Files may be found in the directories copied above
+            for copy in copies:
+                copy.result()
+
+            for package, path in sorted(files.keys()):
+                posix_path = self.__convert_paths_to_posix([path])[0]
+                if self._find_sc_imported_file(posix_path, package, directory):
+                    # File already imported in directory
+                    continue
+
+                abspath = files[(package, path)]
+                if abspath:
+                    filename = self._get_imported_filename(posix_path, package)
+                    dst_path = os.path.join(directory, filename)
+                    self.logger.info(f"Copying {abspath} to '{directory}' directory")
+                    copies.append(executor.submit(shutil.copy, abspath, dst_path))
+                else:
+                    self.error(f'Failed to copy {path}', fatal=True)
+
+            for copy in copies:
+                copy.result()
 
     ###########################################################################
     def _archive_node(self, tar, step=None, index=None, include=None):
@@ -2362,7 +2423,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         The file hash calculation is performed based on the 'algo' setting.
         Supported algorithms include SHA1, SHA224, SHA256, SHA384, SHA512,
-        and MD5.
+        MD5, BLAKE2b, and BLAKE2s. BLAKE3 is supported when the blake3
+        package is installed.
 
         Args:
             *keypath(str): Keypath to parameter.
@@ -2388,25 +2450,46 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             return []
 
         algo = self.get(*keypath, field='hashalgo')
-        hashfunc = getattr(hashlib, algo, None)
+        if algo == 'blake3':
+            try:
+                from blake3 import blake3 as hashfunc
+            except ImportError:
+                hashfunc = None
+        else:
+            hashfunc = getattr(hashlib, algo, None)
         if not hashfunc:
             self.error(f"Unable to use {algo} as the hashing algorithm for [{keypathstr}].")
             return []
 
+        def hash_file(filename):
+            hashobj = hashfunc()
+            with open(filename, "rb") as f:
+                if os.fstat(f.fileno()).st_size < 64 * 1024:
+                    # Mapping small files costs more than reading them
+                    hashobj.update(f.read())
+                else:
+                    # Digest straight from the page cache without copying
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        hashobj.update(mm)
+            return hashobj.hexdigest()
+
         # cycle through all paths
-        hashlist = []
         if filelist:
             self.logger.info(f'Computing hash value for [{keypathstr}]')
+        hash_paths = []
         for filename in filelist:
             if os.path.isfile(filename):
-                hashobj = hashfunc()
-                with open(filename, "rb") as f:
-                    for byte_block in iter(lambda: f.read(4096), b""):
-                        hashobj.update(byte_block)
-                hash_value = hashobj.hexdigest()
-                hashlist.append(hash_value)
+                hash_paths.append(filename)
             else:
                 self.error("Internal hashing error, file not found")
+
+        if len(hash_paths) > 1:
+            # hashlib releases the GIL while digesting, so files can be
+            # hashed concurrently
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                hashlist = list(executor.map(hash_file, hash_paths))
+        else:
+            hashlist = [hash_file(filename) for filename in hash_paths]
         # compare previous hash to new hash
         oldhash = self.schema.get(*keypath, step=step, index=index, field='filehash')
         for i, item in enumerate(oldhash):
@@ -2574,33 +2657,15 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         stepwidth = diewidth + hscribe
         stepheight = dieheight + vscribe
 
-        # Raster dies out from center until you touch edge margin
-        # Work quadrant by quadrant
-        dies = 0
-        for quad in ('q1', 'q2', 'q3', 'q4'):
-            x = 0
-            y = 0
-            if quad == "q1":
-                xincr = stepwidth
-                yincr = stepheight
-            elif quad == "q2":
-                xincr = -stepwidth
-                yincr = stepheight
-            elif quad == "q3":
-                xincr = -stepwidth
-                yincr = -stepheight
-            elif quad == "q4":
-                xincr = stepwidth
-                yincr = -stepheight
-            # loop through all y values from center
-            while math.hypot(0, y) < radius:
-                y = y + yincr
-                x = xincr
-                while math.hypot(x, y) < radius:
-                    x = x + xincr
-                    dies = dies + 1
-
-        return dies
+        # Raster dies out from center until you touch edge margin.
+        # The quadrants are symmetric, so count the first one and scale by four.
+        # Die corners are accumulated step by step, same as walking the raster.
+        import numpy
+        xs = numpy.add.accumulate(numpy.full(int(radius // stepwidth) + 1, stepwidth))
+        ys = numpy.add.accumulate(numpy.full(int(radius // stepheight) + 1, stepheight))
+        inside = numpy.hypot(xs[numpy.newaxis, :], ys[:, numpy.newaxis]) < radius
+
+        return 4 * int(inside.sum())
 
     ###########################################################################
     def grep(self, args, line):
@@ -3110,10 +3175,11 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         design = self.get('design')
         flow = self.get('option', 'flow')
         in_job = self._get_in_job(step, index)
-        if not self._get_pruned_node_inputs(flow, (step, index)):
+        pruned_node_inputs = self._get_pruned_node_inputs(flow, (step, index))
+        if not pruned_node_inputs:
             all_inputs = []
         elif not self.get('flowgraph', flow, step, index, 'select'):
-            all_inputs = self._get_pruned_node_inputs(flow, (step, index))
+            all_inputs = pruned_node_inputs
         else:
             all_inputs = self.get('flowgraph', flow, step, index, 'select')
         for in_step, in_index in all_inputs:
@@ -3370,7 +3436,12 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                                 self.logger.error(f'Step timed out after {timeout} seconds')
                                 utils.terminate_process(proc.pid)
                                 self._haltstep(flow, step, index)
-                            time.sleep(POLL_INTERVAL)
+                            # Wake up as soon as the tool exits rather than
+                            # sleeping out the full poll interval
+                            try:
+                                proc.wait(timeout=POLL_INTERVAL)
+                            except subprocess.TimeoutExpired:
+                                pass
                     except KeyboardInterrupt:
                         interrupt_time = time.time()
                         self.logger.info(f'Received ctrl-c, waiting for {tool} to exit...')
@@ -3789,21 +3860,37 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                             self._clear_record(step, index, record)
 
     def clean_build_dir(self):
+        # Remove job directories left behind by earlier runs that exited
+        # before their background removal finished
+        utils.remove_stale_dirs(self._getworkdir())
+
         if not self.get('option', 'resume') and not self.get('arg', 'step') \
                 and not self.get('option', 'from') and not self.get('record', 'remoteid'):
             # If no step or nodes to start from were specified, the whole flow is being run
             # start-to-finish. Delete the build dir to clear stale results.
             cur_job_dir = self._getworkdir()
             if os.path.isdir(cur_job_dir):
-                shutil.rmtree(cur_job_dir)
+                return utils.remove_dir_in_background(cur_job_dir)
+        return None
 
     def _prepare_nodes(self, nodes_to_run, processes, flow, status):
         '''
         For each node to run, prepare a process and store its dependencies
         '''
-        # Ensure we use spawn for multiprocessing so loggers initialized correctly
+        # Ensure we start fresh processes (spawn or forkserver, never plain fork)
+        # so loggers initialized correctly
         jobname = self.get('option', 'jobname')
-        multiprocessor = multiprocessing.get_context('spawn')
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            # Fork nodes from a server that has already imported siliconcompiler,
+            # so each node does not pay for re-importing it
+            multiprocessor = multiprocessing.get_context('forkserver')
+            multiprocessor.set_forkserver_preload(['siliconcompiler'])
+        else:
+            multiprocessor = multiprocessing.get_context('spawn')
+        environment = dict(os.environ)
+        cwd = os.getcwd()
+        pruned_flowgraph_nodes = self._get_pruned_flowgraph_nodes(flow,
+                                                                  self.get('option', 'prune'))
         for (step, index) in self.nodes_to_execute(flow):
             node = (step, index)
             if status[node] != NodeStatus.PENDING:
@@ -3814,15 +3901,29 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 # we assume we are good to run it.
                 nodes_to_run[node] = []
             else:
-                nodes_to_run[node] = self._get_pruned_node_inputs(flow, (step, index))
+                nodes_to_run[node] = self._get_pruned_node_inputs(flow, (step, index),
+                                                                  pruned_flowgraph_nodes)
+
+            processes[node] = multiprocessor.Process(target=self._runtask_process,
+                                                     args=(environment, cwd,
+                                                           flow, step, index, status))
+
+    def _runtask_process(self, environment, cwd, flow, step, index, status):
+        '''
+        Entry point of node processes started by run().
+
+        Processes forked from the forkserver inherit the server's environment
+        and working directory, so restore the ones run() was called with.
+        '''
+        os.environ.clear()
+        os.environ.update(environment)
+        os.chdir(cwd)
 
-            processes[node] = multiprocessor.Process(target=self._runtask,
-                                                     args=(flow, step, index, status))
+        self._runtask(flow, step, index, status)
 
     def _check_node_dependencies(self, node, deps, status, deps_was_successful):
         had_deps = len(deps) > 0
         step, index = node
-        tool, task = self._get_tool_task(step, index)
 
         # Clear any nodes that have finished from dependency list.
         for in_node in deps.copy():
@@ -3832,37 +3933,63 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 deps_was_successful[node] = True
             if status[in_node] == NodeStatus.ERROR:
                 # Fail if any dependency failed for non-builtin task
-                if not self._is_builtin(tool, task):
+                if not self._is_builtin(*self._get_tool_task(step, index)):
                     deps.clear()
                     status[node] = NodeStatus.ERROR
                     return
 
         # Fail if no dependency successfully finished for builtin task
-        if had_deps and len(deps) == 0 \
-                and self._is_builtin(tool, task) and not deps_was_successful.get(node):
+        if had_deps and len(deps) == 0 and not deps_was_successful.get(node) \
+                and self._is_builtin(*self._get_tool_task(step, index)):
             status[node] = NodeStatus.ERROR
 
-    def _launch_nodes(self, nodes_to_run, processes, status):
+    def _launch_nodes(self, nodes_to_run, processes, flow, status):
         running_nodes = []
         deps_was_successful = {}
+
+        # Cores this process may run on, handed out to nodes as they launch so
+        # concurrent tools do not migrate across each other's cores.
+        if self.get('option', 'pincores') and hasattr(os, 'sched_setaffinity'):
+            free_cores = sorted(os.sched_getaffinity(0))
+        else:
+            free_cores = []
+        node_cores = {}
+
+        # Pending nodes waiting on each node, so that only those need to be
+        # rechecked when its status changes.
+        dependents = {}
+        for node, deps in nodes_to_run.items():
+            for in_node in deps:
+                dependents.setdefault(in_node, []).append(node)
+        changed_nodes = set(nodes_to_run)
+
         while len(nodes_to_run) > 0 or len(running_nodes) > 0:
             # Check for new nodes that can be launched.
-            for node, deps in list(nodes_to_run.items()):
-                # TODO: breakpoint logic:
-                # if node is breakpoint, then don't launch while len(running_nodes) > 0
+            while changed_nodes:
+                nodes_to_check = changed_nodes
+                changed_nodes = set()
+                for node, deps in list(nodes_to_run.items()):
+                    if node not in nodes_to_check:
+                        continue
 
-                self._check_node_dependencies(node, deps, status, deps_was_successful)
+                    # TODO: breakpoint logic:
+                    # if node is breakpoint, then don't launch while len(running_nodes) > 0
 
-                if status[node] == NodeStatus.ERROR:
-                    del nodes_to_run[node]
-                    continue
+                    self._check_node_dependencies(node, deps, status, deps_was_successful)
 
-                # If there are no dependencies left, launch this node and
-                # remove from nodes_to_run.
-                if len(deps) == 0:
-                    processes[node].start()
-                    running_nodes.append(node)
-                    del nodes_to_run[node]
+                    if status[node] == NodeStatus.ERROR:
+                        del nodes_to_run[node]
+                        changed_nodes.update(dependents.get(node, []))
+                        continue
+
+                    # If there are no dependencies left, launch this node and
+                    # remove from nodes_to_run.
+                    if len(deps) == 0:
+                        processes[node].start()
+                        node_cores[node] = self._pin_node_cores(flow, node, processes[node],
+                                                                free_cores)
+                        running_nodes.append(node)
+                        del nodes_to_run[node]
 
             # Check for situation where we have stuff left to run but don't
             # have any nodes running. This shouldn't happen, but we will get
@@ -3872,19 +3999,46 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 self.error('Nodes left to run, but no '
                            'running nodes. From/to may be invalid.', fatal=True)
 
+            # Block until at least one running node exits instead of polling.
+            if running_nodes:
+                sentinels = {processes[node].sentinel: node for node in running_nodes}
+                for sentinel in multiprocessing.connection.wait(list(sentinels)):
+                    # Reap the exited process so its exitcode is available
+                    processes[sentinels[sentinel]].join()
+
             # Check for completed nodes.
-            # TODO: consider staying in this section of loop until a node
-            # actually completes.
             for node in running_nodes.copy():
                 if not processes[node].is_alive():
                     running_nodes.remove(node)
+                    free_cores.extend(node_cores.pop(node))
+                    free_cores.sort()
                     if processes[node].exitcode > 0:
                         status[node] = NodeStatus.ERROR
                     else:
                         status[node] = NodeStatus.SUCCESS
+                    changed_nodes.update(dependents.get(node, []))
 
-            # TODO: exponential back-off with max?
-            time.sleep(0.1)
+    def _pin_node_cores(self, flow, node, process, free_cores):
+        '''
+        Pins a started node process to as many free cores as its task has
+        threads, and returns the cores taken from free_cores. The tool the
+        node launches inherits the affinity. Nodes that do not set threads,
+        or that need more cores than are free, are left unpinned. Only used
+        when ['option', 'pincores'] is set.
+        '''
+        step, index = node
+        tool, task = self._get_tool_task(step, index, flow=flow)
+        threads = self.get('tool', tool, 'task', task, 'threads', step=step, index=index)
+        if not threads or threads > len(free_cores):
+            return []
+
+        cores = free_cores[:threads]
+        try:
+            os.sched_setaffinity(process.pid, cores)
+        except OSError:
+            return []
+        del free_cores[:threads]
+        return cores
 
     def _check_nodes_status(self, flow, status):
         def success(node):
@@ -3933,7 +4087,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         nodes_to_run = {}
         processes = {}
         self._prepare_nodes(nodes_to_run, processes, flow, status)
-        self._launch_nodes(nodes_to_run, processes, status)
+        self._launch_nodes(nodes_to_run, processes, flow, status)
         self._check_nodes_status(flow, status)
 
     ###########################################################################
@@ -3986,7 +4140,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             self.error(f"{flow} flowgraph contains errors and cannot be run.",
                        fatal=True)
 
-        self.clean_build_dir()
+        build_dir_cleanup = self.clean_build_dir()
         self._reset_flow_nodes(flow, self.nodes_to_execute(flow))
 
         # Save current environment
@@ -4005,11 +4159,19 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         # Merge cfgs from last executed tasks, and write out a final manifest.
         self._finalize_run(set(self._get_execution_exit_nodes(flow)), environment, status)
 
+        if build_dir_cleanup:
+            # Wait for the stale results to finish being deleted
+            build_dir_cleanup.join()
+
     def _check_execution_nodes_inputs(self, flow):
+        entry_nodes = set(self._get_execution_entry_nodes(flow))
+        pruned_flowgraph_nodes = self._get_pruned_flowgraph_nodes(flow,
+                                                                  self.get('option', 'prune'))
         for node in self.nodes_to_execute(flow):
-            if node in self._get_execution_entry_nodes(flow):
+            if node in entry_nodes:
                 continue
-            pruned_node_inputs = set(self._get_pruned_node_inputs(flow, node))
+            pruned_node_inputs = set(self._get_pruned_node_inputs(flow, node,
+                                                                  pruned_flowgraph_nodes))
             node_inputs = set(self._get_flowgraph_node_inputs(flow, node))
             tool, task = self._get_tool_task(node[0], node[1], flow=flow)
             if self._is_builtin(tool, task) and not pruned_node_inputs or \
@@ -4025,32 +4187,45 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         '''
         Assumes a flowgraph with valid edges for the inputs
         '''
-        nodes_to_execute = []
-        for from_node in from_nodes:
-            for node in self._nodes_to_execute_recursive(flow, from_node, to_nodes, prune_nodes):
-                if node not in nodes_to_execute:
-                    nodes_to_execute.append(node)
-        return nodes_to_execute
+        flowgraph_outputs = self._get_flowgraph_outputs(flow)
 
-    def _nodes_to_execute_recursive(self, flow, from_node, to_nodes, prune_nodes, path=[]):
-        path = path.copy()
         nodes_to_execute = []
+        selected_nodes = set()
+        # Whether each fully visited node leads to a to node, so shared
+        # subgraphs are only walked once instead of once per path.
+        leads_to_exit = {}
+        path = []
 
-        if from_node in prune_nodes:
-            return []
-        if from_node in path:
-            raise SiliconCompilerError(f'Path {path} would form a circle with {from_node}')
-        path.append(from_node)
-
-        if from_node in to_nodes:
+        def select_path():
             for node in path:
-                nodes_to_execute.append(node)
-        for output_node in self._get_flowgraph_node_outputs(flow, from_node):
-            for node in self._nodes_to_execute_recursive(flow, output_node, to_nodes,
-                                                         prune_nodes, path=path):
-                if node not in nodes_to_execute:
+                if node not in selected_nodes:
+                    selected_nodes.add(node)
                     nodes_to_execute.append(node)
 
+        def visit(node):
+            if node in prune_nodes:
+                return False
+            if node in path:
+                raise SiliconCompilerError(f'Path {path} would form a circle with {node}')
+            if node in leads_to_exit:
+                if leads_to_exit[node]:
+                    select_path()
+                return leads_to_exit[node]
+
+            path.append(node)
+            leads_to = node in to_nodes
+            if leads_to:
+                select_path()
+            for output_node in flowgraph_outputs.get(node, []):
+                if visit(output_node):
+                    leads_to = True
+            path.pop()
+
+            leads_to_exit[node] = leads_to
+            return leads_to
+
+        for from_node in from_nodes:
+            visit(from_node)
         return nodes_to_execute
 
     ###########################################################################
@@ -4089,6 +4264,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         return unreachable_steps
 
     def _reachable_flowgraph_nodes(self, flow, from_nodes, cond=lambda _: True, prune_nodes=[]):
+        flowgraph_outputs = self._get_flowgraph_outputs(flow)
         visited_nodes = set()
         current_nodes = from_nodes.copy()
         while current_nodes:
@@ -4100,8 +4276,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 if cond(current_node):
                     visited_nodes.add(current_node)
                     current_nodes.remove(current_node)
-                    outputs = self._get_flowgraph_node_outputs(flow, current_node)
-                    current_nodes.update(outputs)
+                    current_nodes.update(flowgraph_outputs.get(current_node, []))
             if current_nodes == current_nodes_copy:
                 break
         return visited_nodes
@@ -4115,22 +4290,29 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         from_nodes = set(self._get_flowgraph_entry_nodes(flow))
         return self._reachable_flowgraph_nodes(flow, from_nodes, prune_nodes=prune_nodes)
 
-    def _get_pruned_node_inputs(self, flow, node):
-        prune_nodes = self.get('option', 'prune')
-        pruned_flowgraph_nodes = self._get_pruned_flowgraph_nodes(flow, prune_nodes)
+    def _get_pruned_node_inputs(self, flow, node, pruned_flowgraph_nodes=None):
+        if pruned_flowgraph_nodes is None:
+            prune_nodes = self.get('option', 'prune')
+            pruned_flowgraph_nodes = self._get_pruned_flowgraph_nodes(flow, prune_nodes)
         return list(filter(lambda node: node in pruned_flowgraph_nodes,
                            self._get_flowgraph_node_inputs(flow, node)))
 
     def _get_flowgraph_node_outputs(self, flow, node):
-        node_outputs = []
+        return self._get_flowgraph_outputs(flow).get(node, [])
+
+    def _get_flowgraph_outputs(self, flow):
+        '''
+        Returns a map from each node to the nodes that list it as an input,
+        built in a single pass over the flowgraph.
+        '''
+        flowgraph_outputs = {}
 
-        iter_nodes = self._get_flowgraph_nodes(flow)
-        for iter_node in iter_nodes:
-            iter_node_inputs = self._get_flowgraph_node_inputs(flow, iter_node)
-            if node in iter_node_inputs:
-                node_outputs.append(iter_node)
+        for iter_node in self._get_flowgraph_nodes(flow):
+            flowgraph_outputs.setdefault(iter_node, [])
+            for in_node in dict.fromkeys(self._get_flowgraph_node_inputs(flow, iter_node)):
+                flowgraph_outputs.setdefault(in_node, []).append(iter_node)
 
-        return node_outputs
+        return flowgraph_outputs
 
     ###########################################################################
     def show(self, filename=None, screenshot=False, extension=None):
@@ -4706,6 +4888,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if not filepath:
             return None
 
+        if not any(c in filepath for c in _ENV_VAR_CHARS):
+            # Nothing to expand, so skip swapping in the schema environment
+            return filepath
+
         env_save = os.environ.copy()
         for env in self.getkeys('option', 'env'):
             os.environ[env] = self.get('option', 'env', env)
@@ -4716,7 +4902,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         # variables that don't exist in environment get ignored by `expandvars`,
         # but we can do our own error checking to ensure this doesn't result in
         # silent bugs
-        envvars = re.findall(r'\$(\w+)', resolved_path)
+        envvars = _ENV_VAR_RE.findall(resolved_path)
         for var in envvars:
             self.logger.warning(f'Variable {var} in {filepath} not defined in environment')
 
@@ -4729,23 +4915,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         The mapping looks like:
         path/to/file.ext => file_<md5('path/to/file.ext')>.ext
         '''
-        path = pathlib.PurePosixPath(pathstr)
-        ext = ''.join(path.suffixes)
-
-        # strip off all file suffixes to get just the bare name
-        barepath = path
-        while barepath.suffix:
-            barepath = pathlib.PurePosixPath(barepath.stem)
-        filename = str(barepath.parts[-1])
-
-        if not package:
-            package = ''
-        else:
-            package = f'{package}:'
-        path_to_hash = f'{package}{str(path)}'
-        pathhash = hashlib.sha1(path_to_hash.encode('utf-8')).hexdigest()
-
-        return f'{filename}_{pathhash}{ext}'
+        return _imported_filename(pathstr, package)
 
     def _check_version(self, reported_version, tool, step, index):
         # Based on regex for deprecated "legacy specifier" from PyPA packaging
@@ -5100,6 +5270,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         # Restore current directory
         self.cwd = original_cwd
 
+        import git
         git_data = {}
         try:
             # Check git information
@@ -5156,6 +5327,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         with open(issue_path, 'w') as fd:
             json.dump(issue_information, fd, indent=4, sort_keys=True)
 
+        from jinja2 import Environment, FileSystemLoader
         jinja_env = Environment(loader=FileSystemLoader(os.path.join(self.scroot,
                                                                      'templates',
                                                                      'issue')))
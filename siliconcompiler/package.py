@@ -1,7 +1,6 @@
 import os
 import requests
 import tarfile
-from git import Repo, GitCommandError
 from urllib.parse import urlparse
 import importlib
 import shutil
@@ -15,9 +14,6 @@ import fasteners
 import time
 from pathlib import Path
 
-from github import Github
-import github.Auth
-
 
 def _path(chip, package, download_handler):
     if package in chip._packages:
@@ -100,6 +96,7 @@ def __download_data(chip, package, data, url, data_path, data_path_lock):
     if os.path.exists(data_path):
         chip.logger.info(f'Found cached {package} data at {data_path}')
         if url.scheme in ['git', 'git+https', 'ssh', 'git+ssh']:
+            from git import Repo, GitCommandError
             try:
                 repo = Repo(data_path)
                 if repo.untracked_files or repo.index.diff("HEAD"):
@@ -165,6 +162,8 @@ def _release_data_lock(data_lock):
 
 
 def clone_synchronized(chip, package, data, data_path):
+    from git import GitCommandError
+
     url = urlparse(data['path'])
     try:
         clone_from_git(chip, package, data, data_path)
@@ -179,6 +178,8 @@ def clone_synchronized(chip, package, data, data_path):
 
 
 def clone_from_git(chip, package, data, repo_path):
+    from git import Repo
+
     url = urlparse(data['path'])
     if url.scheme in ['git', 'git+https'] and url.username:
         chip.logger.warning('Your token is in the data source path and will be stored in the '
@@ -315,6 +316,9 @@ def register_private_github_data_source(chip,
                                         repository,
                                         release,
                                         artifact):
+    from github import Github
+    import github.Auth
+
     gh = Github(auth=github.Auth.Token(__get_github_auth_token(package_name)))
     repo = gh.get_repo(repository)
 
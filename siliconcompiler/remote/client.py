@@ -188,9 +188,10 @@ def _remote_preprocess(chip, remote_nodelist):
 
     # This is necessary because the public version of the server somehow loses the information
     # that the entry nodes were already executed
+    flowgraph_outputs = chip._get_flowgraph_outputs(flow)
     entry_nodes_successors = set()
     for node in entry_nodes:
-        entry_nodes_successors.update(chip._get_flowgraph_node_outputs(flow, node))
+        entry_nodes_successors.update(flowgraph_outputs.get(node, []))
     entry_steps_successors = list(map(lambda node: node[0], entry_nodes_successors))
     chip.set('option', 'from', entry_steps_successors)
     # Recover step/index
@@ -3,9 +3,6 @@ import time
 import tempfile
 import json
 
-from streamlit.web import bootstrap
-from streamlit import config as _config
-
 import multiprocessing
 import subprocess
 import atexit
@@ -114,6 +111,11 @@ class Dashboard():
         time.sleep(self.__sleep_time)
 
     def _run_streamlit_bootstrap(self):
+        # Imported here since streamlit is slow to load and only needed
+        # once the dashboard is running
+        from streamlit.web import bootstrap
+        from streamlit import config as _config
+
         for config, val in self.__streamlit_args:
             _config.set_option(config, val)
 
@@ -1,6 +1,5 @@
 import os
 import string
-from PIL import Image, ImageFont, ImageDraw
 
 from siliconcompiler import units
 from siliconcompiler.report.utils import _find_summary_image
@@ -11,6 +10,7 @@ def _generate_summary_image(chip, output_path):
     Takes a layout screenshot and generates a design summary image
     featuring a layout thumbnail and several metrics.
     '''
+    from PIL import Image, ImageFont, ImageDraw
 
     img_path = _find_summary_image(chip)
     if not img_path:
@@ -112,4 +112,5 @@ def _generate_summary_image(chip, output_path):
 
 
 def _open_summary_image(image):
+    from PIL import Image
     Image.open(image).show()
@@ -1,5 +1,3 @@
-import pandas
-
 from siliconcompiler.report.utils import _collect_data, _get_flowgraph_path
 
 
@@ -7,12 +5,6 @@ def _show_summary_table(chip, flow, flowgraph_nodes, show_all_indices):
     '''
     Prints the end of run summary table
     '''
-
-    # Display data
-    pandas.set_option('display.max_rows', 500)
-    pandas.set_option('display.max_columns', 500)
-    pandas.set_option('display.width', 100)
-
     nodes, _, metrics, metrics_unit, metrics_to_show, _ = \
         _collect_data(chip, flow, flowgraph_nodes)
 
@@ -40,7 +32,6 @@ def _show_summary_table(chip, flow, flowgraph_nodes, show_all_indices):
         paramstr = "None"
 
     colwidth = 8  # minimum col width
-    row_labels = [' ' + metric for metric in metrics_to_show]
     column_labels = [f'{step}{index}'.center(colwidth)
                      for step, index in nodes_to_show]
     column_labels.insert(0, 'units')
@@ -81,9 +72,25 @@ def _show_summary_table(chip, flow, flowgraph_nodes, show_all_indices):
     print("-" * 135)
     print(info, "\n")
 
-    df = pandas.DataFrame(data, row_labels, column_labels)
-    if not df.empty:
-        print(df.to_string())
+    if data:
+        print(_format_table(metrics_to_show, column_labels, data))
     else:
         print(' No metrics to display!')
     print("-" * 135)
+
+
+def _format_table(row_labels, column_labels, data):
+    '''
+    Formats the table with left justified row labels and right justified columns
+    '''
+    data = [[f' {value}' for value in row] for row in data]
+    widths = [max(len(label), *[len(row[n]) for row in data])
+              for n, label in enumerate(column_labels)]
+    label_width = max(len(label) for label in row_labels)
+
+    lines = [' ' * label_width + ''.join(f' {label.rjust(width)}'
+                                         for label, width in zip(column_labels, widths))]
+    for label, row in zip(row_labels, data):
+        cells = ''.join(f' {value.rjust(width)}' for value, width in zip(row, widths))
+        lines.append(label.ljust(label_width) + cells)
+    return '\n'.join(lines)
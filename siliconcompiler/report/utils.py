@@ -43,8 +43,22 @@ def _collect_data(chip, flow=None, flowgraph_nodes=None, format_as_string=True):
     # - at least one step in the steps has a non-zero weight for the metric -OR -
     #   at least one step in the steps set a value for it
     metrics_to_show = []
+
+    # Per node lookups that do not depend on the metric
+    node_weights = {}
+    node_tool_task = {}
+    for step, index in nodes:
+        node_weights[step, index] = {
+            metric: chip.get('flowgraph', flow, step, index, 'weight', metric)
+            for metric in chip.getkeys('flowgraph', flow, step, index, 'weight')}
+        node_tool_task[step, index] = chip._get_tool_task(step, index, flow=flow)
+        errors[step, index] = chip.get('flowgraph', flow,
+                                       step, index, 'status') == \
+            NodeStatus.ERROR
+
+    metricoff = chip.get('option', 'metricoff')
     for metric in chip.getkeys('metric'):
-        if metric in chip.get('option', 'metricoff'):
+        if metric in metricoff:
             continue
 
         # Get the unit associated with the metric
@@ -55,22 +69,16 @@ def _collect_data(chip, flow=None, flowgraph_nodes=None, format_as_string=True):
 
         show_metric = False
         for step, index in nodes:
-            if metric in chip.getkeys('flowgraph', flow,
-                                      step, index, 'weight') and \
-               chip.get('flowgraph', flow, step, index, 'weight', metric):
+            if node_weights[step, index].get(metric):
                 show_metric = True
 
             value = chip.get('metric', metric, step=step, index=index)
             if value is not None:
                 show_metric = True
-            tool, task = chip._get_tool_task(step, index, flow=flow)
+            tool, task = node_tool_task[step, index]
             rpts = chip.get('tool', tool, 'task', task, 'report', metric,
                             step=step, index=index)
 
-            errors[step, index] = chip.get('flowgraph', flow,
-                                           step, index, 'status') == \
-                NodeStatus.ERROR
-
             if value is not None:
                 value = _format_value(metric, value, metric_unit, metric_type, format_as_string)
 
@@ -1,7 +1,6 @@
 # Copyright 2022 Silicon Compiler Authors. All Rights Reserved.
 
 import json
-import re
 
 # Default import must be relative, to facilitate tools with Python interfaces
 # (such as KLayout) directly importing the schema package. However, the fallback
@@ -11,7 +10,7 @@ try:
 except ImportError:
     from siliconcompiler.schema.utils import trim
 
-SCHEMA_VERSION = '0.40.4'
+SCHEMA_VERSION = '0.40.5'
 
 #############################################################################
 # PARAM DEFINITION
@@ -70,13 +69,13 @@ def scparam(cfg,
 
         # setting values based on types
         # note (bools are never lists)
-        if re.match(r'bool', sctype):
+        if sctype.startswith('bool'):
             require = 'all'
             if defvalue is None:
                 defvalue = False
-        if re.match(r'\[', sctype) and signature is None:
+        if sctype.startswith('[') and signature is None:
             signature = []
-        if re.match(r'\[', sctype) and defvalue is None:
+        if sctype.startswith('[') and defvalue is None:
             defvalue = []
 
         # mandatory for all
@@ -107,7 +106,7 @@ def scparam(cfg,
             cfg['unit'] = unit
 
         # file only values
-        if re.search(r'file', sctype):
+        if 'file' in sctype:
             cfg['hashalgo'] = hashalgo
             cfg['copy'] = copy
             cfg['node']['default']['default']['date'] = []
@@ -115,7 +114,7 @@ def scparam(cfg,
             cfg['node']['default']['default']['filehash'] = []
             cfg['node']['default']['default']['package'] = []
 
-        if re.search(r'dir', sctype):
+        if 'dir' in sctype:
             cfg['copy'] = copy
             cfg['node']['default']['default']['package'] = []
 
@@ -3073,6 +3072,22 @@ def schema_option(cfg):
             The '-nodisplay' flag prevents SiliconCompiler from
             opening GUI windows such as the final metrics report.""")
 
+    scparam(cfg, ['option', 'pincores'],
+            sctype='bool',
+            scope='job',
+            shorthelp="Pin tasks to cores",
+            switch="-pincores <bool>",
+            example=["cli: -pincores",
+                     "api: chip.set('option', 'pincores', True)"],
+            schelp="""
+            When True, each node launched by a local run is pinned to its
+            own set of free cores, sized by the 'threads' parameter of its
+            task, so that concurrently running tools do not migrate across
+            each other's cores. Nodes that do not set 'threads', or that need
+            more cores than are currently free, are left unpinned and may run
+            on any core. Pinning is only supported on platforms that provide
+            os.sched_setaffinity.""")
+
     scparam(cfg, ['option', 'quiet'],
             sctype='bool',
             pernode='optional',
@@ -9,6 +9,7 @@ import csv
 import gzip
 import json
 import logging
+import math
 import os
 import re
 import pathlib
@@ -19,11 +20,32 @@ import shlex
 try:
     import yaml
     _has_yaml = True
+    try:
+        from yaml import CSafeLoader as _YamlSafeLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlSafeLoader
 except ImportError:
     _has_yaml = False
 
+try:
+    import orjson
+    _has_orjson = True
+except ImportError:
+    _has_orjson = False
+
 from .schema_cfg import schema_cfg
-from .utils import escape_val_tcl, PACKAGE_ROOT
+from .utils import escape_val_tcl, PACKAGE_ROOT, _JSON_MANIFEST_RE, _YAML_MANIFEST_RE
+
+# Leading indentation of each line in orjson's indented output
+_JSON_INDENT_RE = re.compile(r'^( +)', flags=re.MULTILINE)
+
+# Command line switch patterns, compiled once at import
+_ARG_OPT_RE = re.compile(r'(\-\w)(\d+)')
+_ARG_ASSIGN_RE = re.compile(r'(\-\w)(\w+\=\w+)')
+_ARG_PLUSARG_RE = re.compile(r'(\+\w+\+)(.*)')
+_SWITCH_RE = re.compile(r'(-[\w_]+)\s+(.*)')
+_SWITCH_GCC_RE = re.compile(r'(-[\w_]+)(.*)')
+_SWITCH_PLUS_RE = re.compile(r'(\+[\w_\+]+)(.*)')
 
 
 class Schema:
@@ -50,6 +72,9 @@ class Schema:
     GLOBAL_KEY = 'global'
     PERNODE_FIELDS = ('value', 'filehash', 'date', 'author', 'signature', 'package')
 
+    # Parsed command line switches of a default schema, per schema class
+    _cmdline_params_cache = {}
+
     def __init__(self, cfg=None, manifest=None, logger=None):
         if cfg is not None and manifest is not None:
             raise ValueError('You may not specify both cfg and manifest')
@@ -121,13 +146,24 @@ class Schema:
         else:
             fin = open(filepath, 'r')
 
+        # Manifest extensions are matched case-insensitively when reading
+        manifest_path = filepath.lower()
         try:
-            if re.search(r'(\.json|\.sup)(\.gz)*$', filepath, flags=re.IGNORECASE):
-                localcfg = json.load(fin)
-            elif re.search(r'(\.yaml|\.yml)(\.gz)*$', filepath, flags=re.IGNORECASE):
+            if _JSON_MANIFEST_RE.search(manifest_path):
+                if _has_orjson:
+                    data = fin.read()
+                    try:
+                        localcfg = orjson.loads(data)
+                    except orjson.JSONDecodeError:
+                        # Fall back to json for manifests orjson rejects,
+                        # such as NaN or Infinity, which are written with json
+                        localcfg = json.loads(data)
+                else:
+                    localcfg = json.load(fin)
+            elif _YAML_MANIFEST_RE.search(manifest_path):
                 if not _has_yaml:
                     raise ImportError('yaml package required to read YAML manifest')
-                localcfg = yaml.load(fin, Loader=yaml.SafeLoader)
+                localcfg = yaml.load(fin, Loader=_YamlSafeLoader)
             else:
                 raise ValueError(f'File format not recognized {filepath}')
         finally:
@@ -166,21 +202,28 @@ class Schema:
             index = str(index)
 
         if field in self.PERNODE_FIELDS:
-            try:
-                return cfg['node'][step][index][field]
-            except KeyError:
-                if cfg['pernode'] == 'required':
-                    return cfg['node']['default']['default'][field]
-
-            try:
-                return cfg['node'][step][self.GLOBAL_KEY][field]
-            except KeyError:
-                pass
-
-            try:
-                return cfg['node'][self.GLOBAL_KEY][self.GLOBAL_KEY][field]
-            except KeyError:
-                return cfg['node']['default']['default'][field]
+            # Lookups fall through node -> step global -> global -> default.
+            # Misses are common for global parameters, so avoid raising KeyError.
+            nodecfg = cfg['node']
+            stepcfg = nodecfg.get(step)
+            if stepcfg is not None:
+                indexcfg = stepcfg.get(index)
+                if indexcfg is not None and field in indexcfg:
+                    return indexcfg[field]
+            if cfg['pernode'] == 'required':
+                return nodecfg['default']['default'][field]
+
+            if stepcfg is not None:
+                indexcfg = stepcfg.get(self.GLOBAL_KEY)
+                if indexcfg is not None and field in indexcfg:
+                    return indexcfg[field]
+
+            stepcfg = nodecfg.get(self.GLOBAL_KEY)
+            if stepcfg is not None:
+                indexcfg = stepcfg.get(self.GLOBAL_KEY)
+                if indexcfg is not None and field in indexcfg:
+                    return indexcfg[field]
+            return nodecfg['default']['default'][field]
         elif field in cfg:
             return cfg[field]
         else:
@@ -224,13 +267,13 @@ class Schema:
 
         if cfg['lock'] and field != 'lock':
             if logger:
-                logger.debug(f'Failed to set value for {keypath}: parameter is locked')
+                logger.debug('Failed to set value for %s: parameter is locked', keypath)
             return False
 
         if Schema._is_set(cfg, step=step, index=index) and not clobber:
             if logger:
-                logger.debug(f'Failed to set value for {keypath}: clobber is False '
-                             'and parameter is set')
+                logger.debug('Failed to set value for %s: clobber is False '
+                             'and parameter is set', keypath)
             return False
 
         allowed_values = None
@@ -246,7 +289,7 @@ class Schema:
             if step not in cfg['node']:
                 cfg['node'][step] = {}
             if index not in cfg['node'][step]:
-                cfg['node'][step][index] = copy.deepcopy(cfg['node']['default']['default'])
+                cfg['node'][step][index] = Schema._copy_cfg(cfg['node']['default']['default'])
             cfg['node'][step][index][field] = value
         else:
             cfg[field] = value
@@ -283,7 +326,7 @@ class Schema:
                 raise ValueError(f'Invalid field {field}: add() must be called on a list')
 
         if cfg['lock']:
-            self.logger.debug(f'Failed to set value for {keypath}: parameter is locked')
+            self.logger.debug('Failed to set value for %s: parameter is locked', keypath)
             return False
 
         allowed_values = None
@@ -298,7 +341,7 @@ class Schema:
             if modified_step not in cfg['node']:
                 cfg['node'][modified_step] = {}
             if modified_index not in cfg['node'][modified_step]:
-                cfg['node'][modified_step][modified_index] = copy.deepcopy(
+                cfg['node'][modified_step][modified_index] = Schema._copy_cfg(
                     cfg['node']['default']['default'])
             cfg['node'][modified_step][modified_index][field].extend(value)
         else:
@@ -356,7 +399,7 @@ class Schema:
             index = str(index)
 
         if cfg['lock']:
-            self.logger.debug(f'Failed to set value for {keypath}: parameter is locked')
+            self.logger.debug('Failed to set value for %s: parameter is locked', keypath)
             return False
 
         if step is None:
@@ -430,7 +473,7 @@ class Schema:
         documentation.
         """
         cfg = self._search(*keypath)
-        return copy.deepcopy(cfg)
+        return Schema._copy_cfg(cfg)
 
     ###########################################################################
     def valid(self, *args, default_valid=False):
@@ -519,8 +562,10 @@ class Schema:
             return value
 
         if field == 'value':
-            # Push down error_msg from the top since arguments get modified in recursive call
-            error_msg = f'Invalid value {value} for keypath {keypath}: expected type {sc_type}'
+            # Push down error_msg from the top since arguments get modified in recursive call.
+            # The message is only formatted if normalization fails.
+            def error_msg():
+                return f'Invalid value {value} for keypath {keypath}: expected type {sc_type}'
             return Schema._normalize_value(value, sc_type, error_msg, allowed_values)
         else:
             return Schema._normalize_field(value, sc_type, field, keypath)
@@ -548,11 +593,11 @@ class Schema:
             if isinstance(value, str):
                 value = value[1:-1].split(',')
             elif not (isinstance(value, tuple) or isinstance(value, list)):
-                raise TypeError(error_msg)
+                raise TypeError(error_msg())
 
             base_types = sc_type[1:-1].split(',')
             if len(value) != len(base_types):
-                raise TypeError(error_msg)
+                raise TypeError(error_msg())
             return tuple(Schema._normalize_value(v, base_type, error_msg, allowed_values)
                          for v, base_type in zip(value, base_types))
 
@@ -563,7 +608,7 @@ class Schema:
                 return False
             if isinstance(value, bool):
                 return value
-            raise TypeError(error_msg)
+            raise TypeError(error_msg())
 
         try:
             if sc_type == 'int':
@@ -572,28 +617,28 @@ class Schema:
             if sc_type == 'float':
                 return float(value)
         except TypeError:
-            raise TypeError(error_msg) from None
+            raise TypeError(error_msg()) from None
 
         if sc_type == 'str':
             if isinstance(value, str):
                 return value
             else:
-                raise TypeError(error_msg)
+                raise TypeError(error_msg())
 
         if sc_type in ('file', 'dir'):
             if isinstance(value, (str, pathlib.Path)):
                 return str(value)
             else:
-                raise TypeError(error_msg)
+                raise TypeError(error_msg())
 
         if sc_type == 'enum':
             if isinstance(value, str):
                 if value in allowed_values:
                     return value
                 valid = ", ".join(allowed_values)
-                raise ValueError(error_msg + f", and value of {valid}")
+                raise ValueError(error_msg() + f", and value of {valid}")
             else:
-                raise TypeError(error_msg)
+                raise TypeError(error_msg())
 
         raise ValueError(f'Invalid type specifier: {sc_type}')
 
@@ -696,6 +741,17 @@ class Schema:
         # type would work.
         return 'shorthelp' in cfg and isinstance(cfg['shorthelp'], str)
 
+    @staticmethod
+    def _copy_cfg(cfg):
+        # Schema dictionaries only hold dicts, lists and immutable scalars (or
+        # tuples of them), so copy those directly rather than going through
+        # copy.deepcopy()
+        if isinstance(cfg, dict):
+            return {key: Schema._copy_cfg(val) for key, val in cfg.items()}
+        if isinstance(cfg, list):
+            return [Schema._copy_cfg(val) for val in cfg]
+        return cfg
+
     @staticmethod
     def _is_list(field, type):
         is_list = type.startswith('[')
@@ -756,7 +812,7 @@ class Schema:
                 cfg = cfg[key]
             elif 'default' in cfg:
                 if insert_defaults:
-                    cfg[key] = copy.deepcopy(cfg['default'])
+                    cfg[key] = Schema._copy_cfg(cfg['default'])
                     cfg = cfg[key]
                 else:
                     cfg = cfg['default']
@@ -778,25 +834,58 @@ class Schema:
             return self._allkeys()
 
     ###########################################################################
-    def _allkeys(self, cfg=None, keys=None, keylist=None):
+    def _allkeys(self, cfg=None):
         if cfg is None:
             cfg = self.cfg
 
+        keylist = []
         if Schema._is_leaf(cfg):
-            return []
-
-        if keys is None:
-            keylist = []
-            keys = []
-        for k in cfg:
-            newkeys = keys.copy()
-            newkeys.append(k)
-            if Schema._is_leaf(cfg[k]):
-                keylist.append(newkeys)
+            return keylist
+
+        # Depth-first walk with an explicit stack of item iterators, which
+        # keeps dict ordering without recursing or copying partial keypaths
+        is_leaf = Schema._is_leaf
+        stack = [([], iter(cfg.items()))]
+        while stack:
+            keys, items = stack[-1]
+            for k, v in items:
+                if is_leaf(v):
+                    keylist.append(keys + [k])
+                else:
+                    stack.append((keys + [k], iter(v.items())))
+                    break
             else:
-                self._allkeys(cfg=cfg[k], keys=newkeys, keylist=keylist)
+                stack.pop()
         return keylist
 
+    ###########################################################################
+    def _allleaves(self, cfg=None):
+        '''
+        Returns (keypath, leaf) pairs for every parameter in cfg, collected in
+        a single walk so callers can read fields without re-searching.
+        '''
+        if cfg is None:
+            cfg = self.cfg
+
+        leaflist = []
+        if Schema._is_leaf(cfg):
+            return leaflist
+
+        # Same walk as _allkeys(), yielding keypaths as tuples with their leaf
+        is_leaf = Schema._is_leaf
+        stack = [((), iter(cfg.items()))]
+        while stack:
+            keys, items = stack[-1]
+            for k, v in items:
+                if is_leaf(v):
+                    leaflist.append((keys + (k,), v))
+                else:
+                    stack.append((keys + (k,), iter(v.items())))
+                    break
+            else:
+                stack.pop()
+        return leaflist
+
     ###########################################################################
     def _copyparam(self, cfgsrc, cfgdst, keypath):
         '''
@@ -819,13 +908,43 @@ class Schema:
 
     ###########################################################################
     def write_json(self, fout):
-        fout.write(json.dumps(self.cfg, indent=4))
+        # orjson is only used when its output is identical to json.dump below
+        if _has_orjson and Schema._orjson_floats_match(self.cfg):
+            try:
+                data = orjson.dumps(self.cfg, option=orjson.OPT_INDENT_2).decode()
+            except orjson.JSONEncodeError:
+                # Fall back to json for values orjson cannot encode,
+                # such as integers wider than 64 bits
+                data = None
+            # orjson writes non-ASCII characters (and DEL) unescaped, which
+            # breaks manifests opened with a non-UTF-8 locale encoding
+            if data is not None and data.isascii() and '\x7f' not in data:
+                # orjson only indents by two spaces, so double it to match json below
+                fout.write(_JSON_INDENT_RE.sub(lambda m: m.group(1) * 2, data))
+                return
+        json.dump(self.cfg, fout, indent=4)
+
+    ###########################################################################
+    @staticmethod
+    def _orjson_floats_match(cfg):
+        '''
+        Returns False if any float in cfg would be written differently by
+        orjson and json: NaN and infinity (which orjson writes as null) and
+        floats in exponent notation (1e22 rather than 1e+22).
+        '''
+        if isinstance(cfg, float):
+            return math.isfinite(cfg) and 'e' not in repr(cfg)
+        if isinstance(cfg, dict):
+            return all(Schema._orjson_floats_match(value) for value in cfg.values())
+        if isinstance(cfg, (list, tuple)):
+            return all(Schema._orjson_floats_match(value) for value in cfg)
+        return True
 
     ###########################################################################
     def write_yaml(self, fout):
         if not _has_yaml:
             raise ImportError('yaml package required to write YAML manifest')
-        fout.write(yaml.dump(self.cfg, Dumper=YamlIndentDumper, default_flow_style=False))
+        yaml.dump(self.cfg, fout, Dumper=YamlIndentDumper, default_flow_style=False)
 
     ###########################################################################
     def write_tcl(self, fout, prefix="", step=None, index=None, template=None):
@@ -834,9 +953,15 @@ class Schema:
         '''
 
         tcl_set_cmds = []
-        for key in self.allkeys():
-            typestr = self.get(*key, field='type')
-            pernode = self.get(*key, field='pernode')
+        # Keypath parts repeat heavily across leaves, so escape each only once
+        escaped_keyparts = {}
+        for key, leaf in self._allleaves():
+            # print out all non default values
+            if 'default' in key:
+                continue
+
+            typestr = leaf['type']
+            pernode = leaf['pernode']
 
             if pernode == 'required' and (step is None or index is None):
                 # Skip mandatory per-node parameters if step and index are not specified
@@ -849,7 +974,14 @@ class Schema:
                 value = self.get(*key)
 
             # create a TCL dict
-            keystr = ' '.join([escape_val_tcl(keypart, 'str') for keypart in key])
+            escaped_key = []
+            for keypart in key:
+                escaped = escaped_keyparts.get(keypart)
+                if escaped is None:
+                    escaped = escape_val_tcl(keypart, 'str')
+                    escaped_keyparts[keypart] = escaped
+                escaped_key.append(escaped)
+            keystr = ' '.join(escaped_key)
 
             valstr = escape_val_tcl(value, typestr)
 
@@ -861,19 +993,13 @@ class Schema:
             if valstr == '':
                 valstr = '[list ]'
 
-            outstr = f"{prefix} {keystr} {valstr}"
-
-            # print out all non default values
-            if 'default' not in key:
-                tcl_set_cmds.append(outstr)
+            tcl_set_cmds.append(f"{prefix} {keystr} {valstr}")
 
         if template:
             fout.write(template.render(manifest_dict='\n'.join(tcl_set_cmds),
                                        scroot=os.path.abspath(PACKAGE_ROOT)))
         else:
-            for cmd in tcl_set_cmds:
-                fout.write(cmd + '\n')
-            fout.write('\n')
+            fout.write(''.join(cmd + '\n' for cmd in tcl_set_cmds) + '\n')
 
     ###########################################################################
     def write_csv(self, fout):
@@ -900,7 +1026,36 @@ class Schema:
     ###########################################################################
     def copy(self):
         '''Returns deep copy of Schema object.'''
-        return Schema(cfg=self.cfg)
+        # Values are already normalized, so skip the checks done by Schema(cfg=...)
+        schema = Schema(cfg={})
+        schema.cfg = Schema._copy_cfg(self.cfg)
+        return schema
+
+    ###########################################################################
+    def _copy_pruned(self):
+        '''Returns a pruned deep copy of the Schema object.
+
+        Equivalent to copy() followed by prune(), but skips copying the
+        branches and fields that prune() would remove.
+        '''
+        schema = Schema(cfg={})
+        schema.cfg = Schema._copy_pruned_cfg(self.cfg)
+        return schema
+
+    @staticmethod
+    def _copy_pruned_cfg(cfg):
+        pruned = {}
+        for k, v in cfg.items():
+            if k == 'default':
+                continue
+            if Schema._is_leaf(v):
+                pruned[k] = {field: Schema._copy_cfg(val) for field, val in v.items()
+                             if field not in ('help', 'example')}
+            else:
+                branch = Schema._copy_pruned_cfg(v)
+                if branch:
+                    pruned[k] = branch
+        return pruned
 
     ###########################################################################
     def prune(self):
@@ -908,45 +1063,29 @@ class Schema:
 
         Also deletes 'help' and 'example' keys.
         '''
-        # When at top of tree loop maxdepth times to make sure all stale
-        # branches have been removed, not elegant, but stupid-simple
-        # "good enough"
-
-        # 10 should be enough for anyone...
-        maxdepth = 10
-
-        for _ in range(maxdepth):
-            self._prune()
+        Schema._prune(self.cfg)
 
     ###########################################################################
-    def _prune(self, *keypath):
+    @staticmethod
+    def _prune(cfg):
         '''
-        Internal recursive function that creates a local copy of the Chip
-        schema (cfg) with only essential non-empty parameters retained.
-
+        Internal recursive function that removes default/template keys,
+        'help' and 'example' fields and empty branches from cfg in place.
         '''
-        cfg = self._search(*keypath)
-
-        # Prune when the default & value are set to the following
-        # Loop through all keys starting at the top
         for k in list(cfg.keys()):
             # removing all default/template keys
             # reached a default subgraph, delete it
             if k == 'default':
                 del cfg[k]
             # reached leaf-cell
-            elif 'help' in cfg[k].keys():
-                del cfg[k]['help']
-            elif 'example' in cfg[k].keys():
-                del cfg[k]['example']
             elif Schema._is_leaf(cfg[k]):
-                pass
-            # removing stale branches
-            elif not cfg[k]:
-                cfg.pop(k)
-            # keep traversing tree
+                cfg[k].pop('help', None)
+                cfg[k].pop('example', None)
             else:
-                self._prune(*keypath, k)
+                # keep traversing tree, then remove the branch if nothing is left
+                Schema._prune(cfg[k])
+                if not cfg[k]:
+                    del cfg[k]
 
     ###########################################################################
     def _is_empty(self, *keypath):
@@ -1110,65 +1249,63 @@ class Schema:
                                          description=description,
                                          allow_abbrev=False)
 
-        # Get a new schema, in case values have already been set
-        schema_class = type(self)
-        schema = schema_class(logger=self.logger)
+        params, switch_index = self._get_cmdline_params()
 
-        # Iterate over all keys from an empty schema to add parser arguments
-        used_switches = set()
-        for keypath in schema.allkeys():
+        if switchlist:
+            # Only look up the parameters behind the requested switches
+            selected = {}
+            for switch in switchlist:
+                if switch not in switch_index:
+                    raise ValueError(f'{switch} is not a valid commandline argument')
+                for param in switch_index[switch]:
+                    selected[param[0]] = param
+            # Keep schema order so help output is stable
+            params = [param for param in params if param[0] in selected]
+
+        # Add parser arguments for each exposed parameter
+        dest_params = {}
+        for dest, keypath, leaf, switchstrs, metavar in params:
             # Fetch fields from leaf cell
-            helpstr = schema.get(*keypath, field='shorthelp')
-            typestr = schema.get(*keypath, field='type')
-            pernodestr = schema.get(*keypath, field='pernode')
+            helpstr = leaf['shorthelp']
+            typestr = leaf['type']
+            pernodestr = leaf['pernode']
 
-            # argparse 'dest' must be a string, so join keypath with commas
-            dest = '_'.join(keypath)
-
-            switchstrs, metavar = self._get_switches(schema, *keypath)
+            dest_params[dest] = (keypath, leaf, switchstrs, metavar)
 
             # Three switch types (bool, list, scalar)
-            if not switchlist or any(switch in switchlist for switch in switchstrs):
-                used_switches.update(switchstrs)
-                if typestr == 'bool':
-                    # Boolean type arguments
-                    if pernodestr == 'never':
-                        parser.add_argument(*switchstrs,
-                                            nargs='?',
-                                            metavar=metavar,
-                                            dest=dest,
-                                            const='true',
-                                            help=helpstr,
-                                            default=argparse.SUPPRESS)
-                    else:
-                        parser.add_argument(*switchstrs,
-                                            metavar=metavar,
-                                            nargs='?',
-                                            dest=dest,
-                                            action='append',
-                                            help=helpstr,
-                                            default=argparse.SUPPRESS)
-                elif re.match(r'\[', typestr) or pernodestr != 'never':
-                    # list type arguments
+            if typestr == 'bool':
+                # Boolean type arguments
+                if pernodestr == 'never':
                     parser.add_argument(*switchstrs,
+                                        nargs='?',
                                         metavar=metavar,
                                         dest=dest,
-                                        action='append',
+                                        const='true',
                                         help=helpstr,
                                         default=argparse.SUPPRESS)
                 else:
-                    # all the rest
                     parser.add_argument(*switchstrs,
                                         metavar=metavar,
+                                        nargs='?',
                                         dest=dest,
+                                        action='append',
                                         help=helpstr,
                                         default=argparse.SUPPRESS)
-
-        # Check if there are invalid switches
-        if switchlist:
-            for switch in switchlist:
-                if switch not in used_switches:
-                    raise ValueError(f'{switch} is not a valid commandline argument')
+            elif typestr.startswith('[') or pernodestr != 'never':
+                # list type arguments
+                parser.add_argument(*switchstrs,
+                                    metavar=metavar,
+                                    dest=dest,
+                                    action='append',
+                                    help=helpstr,
+                                    default=argparse.SUPPRESS)
+            else:
+                # all the rest
+                parser.add_argument(*switchstrs,
+                                    metavar=metavar,
+                                    dest=dest,
+                                    help=helpstr,
+                                    default=argparse.SUPPRESS)
 
         if input_map is not None and input_map_handler:
             parser.add_argument('source',
@@ -1182,21 +1319,14 @@ class Schema:
         # Iterate from index 1, otherwise we end up with script name as a
         # 'source' positional argument
         for argument in sys.argv[1:]:
-            # Split switches with one character and a number after (O0,O1,O2)
-            opt = re.match(r'(\-\w)(\d+)', argument)
-            # Split assign switches (-DCFG_ASIC=1)
-            assign = re.search(r'(\-\w)(\w+\=\w+)', argument)
-            # Split plusargs (+incdir+/path)
-            plusarg = re.search(r'(\+\w+\+)(.*)', argument)
-            if opt:
-                scargs.append(opt.group(1))
-                scargs.append(opt.group(2))
-            elif plusarg:
-                scargs.append(plusarg.group(1))
-                scargs.append(plusarg.group(2))
-            elif assign:
-                scargs.append(assign.group(1))
-                scargs.append(assign.group(2))
+            # Try each split in priority order, stopping at the first match:
+            # switches with one character and a number after (O0,O1,O2),
+            # plusargs (+incdir+/path), then assign switches (-DCFG_ASIC=1)
+            split = _ARG_OPT_RE.match(argument) or \
+                _ARG_PLUSARG_RE.search(argument) or \
+                _ARG_ASSIGN_RE.search(argument)
+            if split:
+                scargs.extend(split.group(1, 2))
             else:
                 scargs.append(argument)
 
@@ -1261,7 +1391,13 @@ class Schema:
 
         # Cycle through all command args and write to manifest
         for dest, vals in cmdargs.items():
-            keypath = dest.split('_')
+            # Fields resolved while building the parser
+            keypath, leaf, switches, metavar = dest_params[dest]
+            switchstr = '/'.join(switches)
+            num_free_keys = keypath.count('default')
+            sctype = leaf['type']
+            is_list = sctype.startswith('[')
+            pernode = leaf['pernode']
 
             # Turn everything into a list for uniformity
             if not isinstance(vals, list):
@@ -1274,27 +1410,21 @@ class Schema:
                     item = ''
 
                 if preprocess_keys:
-                    item = preprocess_keys(keypath, item)
-
-                num_free_keys = keypath.count('default')
-
-                switches, metavar = self._get_switches(schema, *keypath)
-                switchstr = '/'.join(switches)
+                    # Pass a copy, since keypath is shared through the cache
+                    item = preprocess_keys(list(keypath), item)
 
-                if len(item.split(' ')) < num_free_keys + 1:
+                # We replace 'default' in keypath with first N words in provided
+                # value.
+                *free_keys, remainder = item.split(' ', num_free_keys)
+                if len(free_keys) < num_free_keys:
                     # Error out if value provided doesn't have enough words to
                     # fill in 'default' keys.
                     raise ValueError(f'Invalid value {item} for switch {switchstr}. '
                                      f'Expected format {metavar}.')
 
-                # We replace 'default' in keypath with first N words in provided
-                # value.
-                *free_keys, remainder = item.split(' ', num_free_keys)
                 args = [free_keys.pop(0) if key == 'default' else key for key in keypath]
 
                 # Remainder is the value we want to set, possibly with a step/index value beforehand
-                sctype = self.get(*keypath, field='type')
-                pernode = self.get(*keypath, field='pernode')
                 step, index = None, None
                 if pernode == 'required':
                     try:
@@ -1343,9 +1473,9 @@ class Schema:
                 self.logger.info(msg)
 
                 # Storing in manifest
-                typestr = schema.get(*keypath, field='type')
-                if typestr.startswith('['):
-                    if self.valid(*args):
+                if is_list:
+                    # Keypaths without free keys always exist in the schema
+                    if not num_free_keys or self.valid(*args):
                         self.add(*args, val, step=step, index=index)
                     else:
                         self.set(*args, val, step=step, index=index, clobber=True)
@@ -1358,11 +1488,39 @@ class Schema:
         return extra_params
 
     ###########################################################################
-    def _get_switches(self, schema, *keypath):
-        '''Helper function for parsing switches and metavars for a keypath.'''
-        # Switch field fully describes switch format
-        switch = schema.get(*keypath, field='switch')
+    def _get_cmdline_params(self):
+        '''
+        Returns the command line parameters of an empty schema of this class,
+        as a list of (dest, keypath, leaf, switches, metavar) tuples in schema
+        order, and a dictionary mapping each switch to its parameters. The
+        keypaths and switches are tuples, since they are shared between calls.
+        '''
+        schema_class = type(self)
+        if schema_class not in Schema._cmdline_params_cache:
+            # Use a new schema, in case values have already been set
+            schema = schema_class(logger=self.logger)
+
+            params = []
+            switch_index = {}
+            for keypath, leaf in schema._allleaves():
+                switchstrs, metavar = self._get_switches(leaf['switch'])
+                # argparse 'dest' must be a string, so join keypath with underscores
+                param = ('_'.join(keypath), tuple(keypath), leaf, tuple(switchstrs), metavar)
+                params.append(param)
+                for switch in switchstrs:
+                    switch_index.setdefault(switch, []).append(param)
+
+            Schema._cmdline_params_cache[schema_class] = (params, switch_index)
+
+        # Copy the containers so callers cannot modify the cached entries
+        params, switch_index = Schema._cmdline_params_cache[schema_class]
+        return list(params), {switch: list(switch_params)
+                              for switch, switch_params in switch_index.items()}
 
+    ###########################################################################
+    def _get_switches(self, switch):
+        '''Helper function for parsing switches and metavars from a switch field.'''
+        # Switch field fully describes switch format
         if switch is None:
             switches = []
         elif isinstance(switch, list):
@@ -1374,9 +1532,9 @@ class Schema:
         # parse out switch from metavar
         # TODO: should we validate that metavar matches for each switch?
         for switch in switches:
-            switchmatch = re.match(r'(-[\w_]+)\s+(.*)', switch)
-            gccmatch = re.match(r'(-[\w_]+)(.*)', switch)
-            plusmatch = re.match(r'(\+[\w_\+]+)(.*)', switch)
+            switchmatch = _SWITCH_RE.match(switch)
+            gccmatch = _SWITCH_GCC_RE.match(switch)
+            plusmatch = _SWITCH_PLUS_RE.match(switch)
 
             if switchmatch:
                 switchstr = switchmatch.group(1)
@@ -1421,7 +1579,7 @@ class Schema:
             if 'default' in keylist:
                 continue
             typestr = schema.get(*keylist, field='type')
-            should_append = re.match(r'\[', typestr) and not clear
+            should_append = typestr.startswith('[') and not clear
 
             if allow_missing_keys and not self.valid(*keylist, default_valid=True):
                 self.logger.warning(f'{keylist} not found in schema, skipping...')
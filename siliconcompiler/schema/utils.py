@@ -10,6 +10,15 @@ import sys
 
 PACKAGE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
 
+# Environment variable reference ($VAR) in a path
+_ENV_VAR_RE = re.compile(r'\$(\w+)')
+# Manifest file formats, optionally gzip compressed. These are case-sensitive;
+# callers that accept any case match against the lowercased path.
+_JSON_MANIFEST_RE = re.compile(r'(\.json|\.sup)(\.gz)*$')
+_YAML_MANIFEST_RE = re.compile(r'(\.yaml|\.yml)(\.gz)*$')
+_TCL_MANIFEST_RE = re.compile(r'(\.tcl)(\.gz)*$')
+_CSV_MANIFEST_RE = re.compile(r'(\.csv)(\.gz)*$')
+
 
 def escape_val_tcl(val, typestr):
     '''Recursive helper function for converting Python values to safe TCL
@@ -43,7 +52,7 @@ def escape_val_tcl(val, typestr):
         return '"' + escaped_val + '"'
     elif typestr in ('file', 'dir'):
         # Replace $VAR with $env(VAR) for tcl
-        val = re.sub(r'\$(\w+)', r'$env(\1)', val)
+        val = _ENV_VAR_RE.sub(r'$env(\1)', val)
         # Same escapes as applied to string, minus $ (since we want to resolve env vars).
         escaped_val = (val.replace('\\', '\\\\')  # escape '\' to avoid backslash substitution
                                                   # (do this first, since other replaces insert '\')
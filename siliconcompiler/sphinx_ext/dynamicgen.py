@@ -10,10 +10,16 @@ from sphinx.domains.std import StandardDomain
 from sphinx.addnodes import pending_xref
 import docutils
 
+import contextlib
+import hashlib
 import importlib
+import io
+import json
 import pkgutil
 import os
+import pickle
 import subprocess
+import sys
 
 import siliconcompiler
 from siliconcompiler.schema import Schema, utils
@@ -29,7 +35,8 @@ from siliconcompiler.sphinx_ext.utils import (
     link,
     image,
     get_ref_id,
-    literalblock
+    literalblock,
+    std_ref
 )
 
 #############
@@ -39,9 +46,44 @@ from siliconcompiler.sphinx_ext.utils import (
 # We need this in a few places, so just make it global
 SC_ROOT = os.path.abspath(f'{__file__}/../../../')
 
+# Pickled results of make_docs(), keyed by directive, module file and its
+# modification time, since a tool's make_docs() is run once for each of its tasks
+_make_docs_cache = {}
+
+# Modules executed from a file, keyed by path, along with the file's
+# modification time when it was executed
+_module_cache = {}
+
+
+def load_module_from_path(name, path):
+    '''Executes the module at path, reusing the module from a previous call
+    while the file is unchanged. Returns None if path is not a module.'''
+    mtime = os.path.getmtime(path)
+    cached = _module_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    if not spec:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _module_cache[path] = (mtime, module)
+    return module
+
+
+def get_pruned_dict(chip, *keypath):
+    '''Returns a pruned copy of the schema dictionary at keypath, copying only
+    the parameters that are kept.'''
+    return Schema._copy_pruned_cfg(chip.schema._search(*keypath))
+
 
 def build_schema_value_table(cfg, refdoc, keypath_prefix=None, skip_zero_weight=False):
     '''Helper function for displaying values set in schema as a docutils table.'''
+    if not cfg:
+        # Nothing to display, e.g. everything was pruned
+        return None
+
     table = [[strong('Keypath'), strong('Value')]]
 
     # Nest received dictionary under keypath_prefix
@@ -82,7 +124,10 @@ def build_schema_value_table(cfg, refdoc, keypath_prefix=None, skip_zero_weight=
             val_node = format_single_value_file(value, package)
         return val_node
 
-    schema = Schema(rooted_cfg)
+    # Values are already normalized and only read here, so skip the copy and
+    # checks done by Schema(cfg=...)
+    schema = Schema(cfg={})
+    schema.cfg = rooted_cfg
     for kp in schema.allkeys():
         if skip_zero_weight and \
            len(kp) == 6 and kp[0] == 'flowgraph' and kp[-2] == 'weight' and \
@@ -135,8 +180,7 @@ def build_package_table(schema):
         packages = [p for p in packages if p]
         return list(set(packages))
 
-    schema = Schema(cfg=schema)
-    packages = collect_packages(schema.cfg)
+    packages = collect_packages(schema)
 
     if not packages:
         return None
@@ -274,7 +318,13 @@ class DynamicGen(SphinxDirective):
         directory.'''
         modules = []
         for importer, modname, _ in pkgutil.iter_modules([module_dir]):
-            module = importer.find_module(modname).load_module(modname)
+            spec = importer.find_spec(modname)
+            module = sys.modules.get(modname)
+            if getattr(module, '__file__', None) != spec.origin:
+                # Only execute modules that have not already been loaded
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[modname] = module
+                spec.loader.exec_module(module)
             modules.append((module, modname))
 
         return modules
@@ -282,10 +332,8 @@ class DynamicGen(SphinxDirective):
     def parse_rst(self, content, s):
         '''Helper for parsing reStructuredText content, adding it directly to
         section `s`.'''
-        rst = ViewList()
         # use fake filename 'inline' for error # reporting
-        for i, line in enumerate(content.split('\n')):
-            rst.append(line, 'inline', i)
+        rst = ViewList(content.split('\n'), source='inline')
         nested_parse_with_titles(self.state, rst, s)
 
     def package_information(self, chip, modname):
@@ -320,10 +368,14 @@ class DynamicGen(SphinxDirective):
         else:
             return False
 
-        builtin = os.path.abspath(path).startswith(SC_ROOT)
+        try:
+            relpath = os.path.relpath(path, SC_ROOT)
+        except ValueError:
+            # On a different drive than SC_ROOT
+            relpath = os.pardir
+        builtin = not relpath.startswith(os.pardir)
 
         if builtin:
-            relpath = path[len(SC_ROOT) + 1:]
             gh_root = 'https://github.com/siliconcompiler/siliconcompiler/blob/main'
             gh_link = f'{gh_root}/{relpath}'
             filename = os.path.basename(relpath)
@@ -372,14 +424,29 @@ class DynamicGen(SphinxDirective):
         return siliconcompiler.Chip('<design>')
 
     def _handle_make_docs(self, chip, module):
+        '''Runs the module's make_docs() on chip, returning (docs_chip, configured).
+
+        When make_docs() only modifies chip in place, docs_chip holds that
+        configuration and callers must continue with it rather than chip,
+        since a cached result is a separate copy.'''
         make_docs = self.get_make_docs_method(module)
         if make_docs:
+            path = getattr(module, '__file__', None)
+            key = (type(self), path, os.path.getmtime(path)) if path else None
+            if key in _make_docs_cache:
+                docs_chip, docs_configured = _make_docs_cache[key]
+                return (pickle.loads(docs_chip), docs_configured)
+
             new_chip = make_docs(chip)
             if new_chip:
                 # make_docs returned something so it's fully configured
-                return (new_chip, True)
+                docs = (new_chip, True)
             else:
-                return (chip, False)
+                docs = (chip, False)
+            if key:
+                # Store a copy, since callers go on to modify the returned chip
+                _make_docs_cache[key] = (pickle.dumps(docs[0]), docs[1])
+            return docs
         return (None, False)
 
     def _handle_setup(self, chip, module):
@@ -398,6 +465,9 @@ class DynamicGen(SphinxDirective):
         docs_chip, docs_configured = self._handle_make_docs(chip, module)
         if docs_chip and docs_configured:
             return docs_chip
+        if docs_chip:
+            # make_docs configured the chip in place (or it came from the cache)
+            chip = docs_chip
 
         return self._handle_setup(chip, module)
 
@@ -437,9 +507,10 @@ class DynamicGen(SphinxDirective):
         leaves = {}
         child_sections = []
         for key in schema.getkeys(*keypath):
-            if Schema._is_leaf(schema.getdict(*keypath, key)):
-                val = schema.getdict(*keypath, key)
-                leaves.update({key: val})
+            # Only read here, so no need for a copy from getdict()
+            val = schema._search(*keypath, key)
+            if Schema._is_leaf(val):
+                leaves[key] = val
             else:
                 children = self.build_config_recursive(
                     schema,
@@ -479,7 +550,23 @@ class FlowGen(DynamicGen):
 
     def extra_content(self, chip, modname):
         flow_path = os.path.join(self.env.app.outdir, f'_images/gen/{modname}.svg')
-        chip.write_flowgraph(flow_path, flow=chip.design)
+
+        # Only render the flowgraph if it changed since the last build
+        flowgraph = chip.getdict('flowgraph', chip.design)
+        flow_hash = hashlib.sha256(json.dumps([siliconcompiler.__version__, flowgraph],
+                                              sort_keys=True).encode()).hexdigest()
+        hash_path = os.path.join(self.env.app.doctreedir, 'flowgraphs', f'{modname}.sha256')
+        prev_hash = None
+        if os.path.isfile(hash_path):
+            with open(hash_path) as f:
+                prev_hash = f.read()
+
+        if not os.path.isfile(flow_path) or prev_hash != flow_hash:
+            chip.write_flowgraph(flow_path, flow=chip.design)
+            os.makedirs(os.path.dirname(hash_path), exist_ok=True)
+            with open(hash_path, 'w') as f:
+                f.write(flow_hash)
+
         return [image(flow_path, center=True)]
 
     def display_config(self, chip, modname):
@@ -500,12 +587,7 @@ class FlowGen(DynamicGen):
         for step in steps:
             section = build_section(step, self.get_ref(name, 'step', step))
             step_cfg = {}
-            cfg = chip.getdict('flowgraph', chip.design, step)
-            if cfg is None:
-                continue
-            schema = Schema(cfg=cfg)
-            schema.prune()
-            pruned = schema.cfg
+            pruned = get_pruned_dict(chip, 'flowgraph', chip.design, step)
             if chip.design not in step_cfg:
                 step_cfg[chip.design] = {}
             step_cfg[chip.design][step] = pruned
@@ -622,6 +704,9 @@ class ToolGen(DynamicGen):
             docs_chip, docs_configured = self._handle_make_docs(chip, toolmodule)
         if docs_configured:
             return docs_chip
+        if docs_chip:
+            # make_docs configured the chip in place (or it came from the cache)
+            chip = docs_chip
 
         # set values for current step
         toolname = module.__name__
@@ -639,10 +724,7 @@ class ToolGen(DynamicGen):
 
     def display_config(self, chip, modname):
         '''Display config under `eda, <modname>` in a single table.'''
-        cfg = chip.getdict('tool', modname)
-        schema = Schema(cfg=cfg)
-        schema.prune()
-        pruned = schema.cfg
+        pruned = get_pruned_dict(chip, 'tool', modname)
         if 'task' in pruned:
             # Remove task specific items since they will be documented
             # by the task documentation
@@ -655,10 +737,7 @@ class ToolGen(DynamicGen):
 
     def task_display_config(self, chip, toolname, taskname):
         '''Display config under `eda, <modname>` in a single table.'''
-        cfg = chip.getdict('tool', toolname, 'task', taskname)
-        schema = Schema(cfg=cfg)
-        schema.prune()
-        pruned = schema.cfg
+        pruned = get_pruned_dict(chip, 'tool', toolname, 'task', taskname)
         table = build_schema_value_table(pruned, self.env.docname,
                                          keypath_prefix=['tool', toolname, 'task', taskname])
         if table is not None:
@@ -674,22 +753,20 @@ class ToolGen(DynamicGen):
         add an __init__.py to make the directory a module itself.
         '''
         modules = []
-        for toolname in os.listdir(module_dir):
+        with os.scandir(module_dir) as entries:
+            tooldirs = [entry.name for entry in entries if entry.is_dir()]
+        for toolname in tooldirs:
             if (toolname == "template"):
                 # No need to include empty template in documentation
                 continue
             # skip over directories/files that don't match the structure of tool
             # directories (otherwise we'll get confused by Python metadata like
             # __init__.py or __pycache__/)
-            if not os.path.isdir(f'{module_dir}/{toolname}'):
-                continue
             path = f'{module_dir}/{toolname}/{toolname}.py'
             if not os.path.exists(path):
                 continue
 
-            spec = importlib.util.spec_from_file_location(toolname, path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            module = load_module_from_path(toolname, path)
 
             modules.append((module, toolname))
 
@@ -746,7 +823,10 @@ class ToolGen(DynamicGen):
         sections = []
         path = os.path.abspath(path)
         module_dir = os.path.dirname(path)
-        for taskfile in os.listdir(module_dir):
+        with os.scandir(module_dir) as entries:
+            # skip if not a file
+            taskfiles = [entry.name for entry in entries if entry.is_file()]
+        for taskfile in taskfiles:
             if taskfile == "__init__.py":
                 # skip init
                 continue
@@ -756,21 +836,15 @@ class ToolGen(DynamicGen):
                 # skip tool module
                 continue
 
-            if not os.path.isfile(task_path):
-                # skip if not a file
-                continue
-
-            spec = importlib.util.spec_from_file_location(taskfile, task_path)
-            if not spec:
-                # unable to load, probably not a python file
-                continue
-            taskmodule = importlib.util.module_from_spec(spec)
             try:
-                spec.loader.exec_module(taskmodule)
+                taskmodule = load_module_from_path(taskfile, task_path)
             except Exception:
                 # Module failed to load
                 # klayout imports pya which is only defined in klayout
                 continue
+            if not taskmodule:
+                # unable to load, probably not a python file
+                continue
 
             taskname = os.path.splitext(os.path.basename(task_path))[0]
 
@@ -802,9 +876,8 @@ class TargetGen(DynamicGen):
             modlist = nodes.bullet_list()
             for module in modules:
                 list_item = nodes.list_item()
-                # TODO: replace with proper docutils nodes: sphinx.addnodes.pending_xref
                 modkey = get_ref_id(DynamicGen.get_ref_key(*refprefix, module))
-                self.parse_rst(f':ref:`{module}<{modkey}>`', list_item)
+                list_item += nodes.paragraph('', '', std_ref(modkey, module, self.env.docname))
                 modlist += list_item
 
             section += modlist
@@ -831,12 +904,11 @@ class TargetGen(DynamicGen):
         if checklist_section is not None:
             sections.append(checklist_section)
 
-        filtered_cfg = {}
+        pruned_cfg = {}
         for key in ('asic', 'constraint', 'option'):
-            filtered_cfg[key] = chip.getdict(key)
-        schema = Schema(cfg=filtered_cfg)
-        schema.prune()
-        pruned_cfg = schema.cfg
+            pruned = get_pruned_dict(chip, key)
+            if pruned:
+                pruned_cfg[key] = pruned
 
         if len(pruned_cfg) > 0:
             schema_section = build_section('Configuration', self.get_configuration_ref_key(modname))
@@ -856,15 +928,38 @@ class AppGen(DynamicGen):
             return None
 
         cmd_name = modname.replace('_', '-')
-        cmd = [cmd_name, '--help']
-
-        output = subprocess.check_output(cmd).decode('utf-8')
+        output = self.get_help(module, cmd_name)
 
         section = build_section(cmd_name, self.get_ref(cmd_name))
         section += literalblock(output)
 
         return section
 
+    def get_help(self, module, cmd_name):
+        '''Returns the --help output of an app, running its main() in this
+        process instead of starting a new interpreter for each app.'''
+        main = getattr(module, 'main', None)
+        if not main:
+            return subprocess.check_output([cmd_name, '--help']).decode('utf-8')
+
+        output = io.StringIO()
+        argv = sys.argv
+        columns = os.environ.get('COLUMNS')
+        # Wrap help to the same width as when it is written to a pipe
+        os.environ['COLUMNS'] = columns or '80'
+        sys.argv = [cmd_name, '--help']
+        try:
+            with contextlib.redirect_stdout(output):
+                main()
+        except SystemExit:
+            # argparse exits after printing help
+            pass
+        finally:
+            sys.argv = argv
+            if columns is None:
+                del os.environ['COLUMNS']
+        return output.getvalue()
+
 
 class ChecklistGen(DynamicGen):
     PATH = 'checklists'
@@ -901,16 +996,14 @@ class ExampleGen(DynamicGen):
         examples_dir = f'{SC_ROOT}/examples'
 
         modules = []
-        for example in os.listdir(examples_dir):
-            if not os.path.isdir(f'{examples_dir}/{example}'):
-                continue
+        with os.scandir(examples_dir) as entries:
+            examples = [entry.name for entry in entries if entry.is_dir()]
+        for example in examples:
             path = f'{examples_dir}/{example}/{example}.py'
             if not os.path.exists(path):
                 continue
 
-            spec = importlib.util.spec_from_file_location(example, path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            module = load_module_from_path(example, path)
 
             modules.append((module, example))
 
@@ -119,7 +119,7 @@ class CategorySummary(SphinxDirective):
 
         # Descend through defaults until we find the real items
         prefix = [category]
-        while 'default' in chip.getdict(*prefix).keys():
+        while 'default' in chip.schema._search(*prefix):
             prefix.append('default')
 
         for item in chip.getkeys(*prefix):
@@ -139,15 +139,8 @@ class CategorySummary(SphinxDirective):
 class CategoryGroupTable(SphinxDirective):
 
     def count_keys(self, schema, *keypath):
-        cfgs = schema.getdict(*keypath)
-        count = 0
-        for key, cfg in cfgs.items():
-            if schema._is_leaf(cfg):
-                count += 1
-            else:
-                count += self.count_keys(schema, *keypath, key)
-
-        return count
+        # Walk the subtree in place rather than through a deep copy from getdict()
+        return len(schema._allkeys(cfg=schema._search(*keypath)))
 
     def run(self):
         self.env.note_dependency(__file__)
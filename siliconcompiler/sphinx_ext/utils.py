@@ -1,5 +1,6 @@
 from docutils import nodes
 import sphinx.addnodes
+import functools
 
 from siliconcompiler.schema import Schema
 
@@ -71,6 +72,7 @@ def build_section_with_target(text, key, ctx):
     return sec
 
 
+@functools.lru_cache(maxsize=None)
 def get_ref_id(key):
     return nodes.make_id(key + "-ref")
 
@@ -123,11 +125,17 @@ def build_list(items, enumerated=False):
     return list
 
 
+@functools.lru_cache(maxsize=1)
+def _default_schema_cfg():
+    # Only read, so every keypath can share one default schema
+    return Schema().cfg
+
+
 def keypath(key_path, refdoc, key_text=None):
     '''Helper function for displaying Schema keypaths.'''
     text_parts = []
     key_parts = []
-    cfg = Schema().cfg
+    cfg = _default_schema_cfg()
     for key in key_path:
         if list(cfg.keys()) != ['default']:
             text_parts.append(f"'{key}'")
@@ -164,3 +172,17 @@ def keypath(key_path, refdoc, key_text=None):
     refnode += code(text)
 
     return refnode
+
+
+def std_ref(target, text, refdoc):
+    '''Helper function for referencing a label, as :ref:`text<target>` would.'''
+    opt = {'refdoc': refdoc,
+           'refdomain': 'std',
+           'reftype': 'ref',
+           'refexplicit': True,
+           'refwarn': True}
+    refnode = sphinx.addnodes.pending_xref('', **opt)
+    refnode['reftarget'] = target
+    refnode += nodes.inline('', text, classes=['xref', 'std', 'std-ref'])
+
+    return refnode
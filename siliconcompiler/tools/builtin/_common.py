@@ -89,27 +89,25 @@ def _minmax(chip, *nodes, op=None):
                                             "metric.")
                         failed[step][index] = True
 
+    # Fetch metric values once for the passing nodes
+    passed = [node for node in nodelist if not failed[node[0]][node[1]]]
+    metrics = chip.getkeys('metric')
+    values = {}
+    for step, index in passed:
+        values[step, index] = {metric: chip.get('metric', metric, step=step, index=index)
+                               for metric in metrics}
+
     # Calculate max/min values for each metric
     max_val = {}
     min_val = {}
-    for metric in chip.getkeys('metric'):
-        max_val[metric] = 0
-        min_val[metric] = float("inf")
-        for step, index in nodelist:
-            if not failed[step][index]:
-                real = chip.get('metric', metric, step=step, index=index)
-                if real is None:
-                    continue
-                max_val[metric] = max(max_val[metric], real)
-                min_val[metric] = min(min_val[metric], real)
-
-    # Select the minimum index
-    best_score = float('inf') if op == 'minimum' else float('-inf')
-    winner = None
-    for step, index in nodelist:
-        if failed[step][index]:
-            continue
-
+    for metric in metrics:
+        reals = [values[node][metric] for node in passed if values[node][metric] is not None]
+        max_val[metric] = max([0, *reals])
+        min_val[metric] = min(reals, default=float("inf"))
+
+    # Score each node once
+    scores = {}
+    for step, index in passed:
         score = 0.0
         for metric in chip.getkeys('flowgraph', flow, step, index, 'weight'):
             weight = chip.get('flowgraph', flow, step, index, 'weight', metric)
@@ -117,7 +115,7 @@ def _minmax(chip, *nodes, op=None):
                 # skip if weight is 0 or None
                 continue
 
-            real = chip.get('metric', metric, step=step, index=index)
+            real = values[step, index][metric]
             if real is None:
                 chip.error(f'Metric {metric} has weight for {step}{index} '
                            'but it has not been set.', fatal=True)
@@ -127,12 +125,16 @@ def _minmax(chip, *nodes, op=None):
             else:
                 scaled = max_val[metric]
             score = score + scaled * weight
+        scores[step, index] = score
+
+    if not scores:
+        return (float('inf') if op == 'minimum' else float('-inf'), None)
 
-        if ((op == 'minimum' and score < best_score) or (op == 'maximum' and score > best_score)):
-            best_score = score
-            winner = (step, index)
+    # First node wins ties, same as a strict comparison scan
+    select = min if op == 'minimum' else max
+    winner = select(scores, key=scores.get)
 
-    return (best_score, winner)
+    return (scores[winner], winner)
 
 
 def run(chip):
@@ -47,7 +47,7 @@ def _select_inputs(chip, step, index):
             chip.error(f"Missing metric for {metric} in {inputs[0]}{inputs[1]}", fatal=True)
 
         metric_type = chip.get('metric', metric, field='type')
-        goal = Schema._normalize_value(goal, metric_type, "", None)
+        goal = Schema._normalize_value(goal, metric_type, lambda: "", None)
         if not chip._safecompare(value, op, goal):
             chip.error(f"{step}{index} fails '{metric}' metric: {value}{op}{goal}")
 
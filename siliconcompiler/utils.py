@@ -1,10 +1,12 @@
 import os
+import re
 import shutil
 import psutil
+import threading
+import uuid
 from pathlib import Path
 from siliconcompiler._metadata import version as sc_version
 import contextlib
-from jinja2 import Environment, FileSystemLoader
 
 
 PACKAGE_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -24,6 +26,38 @@ def link_symlink_copy(srcfile, dstfile):
             pass
 
 
+def remove_dir_in_background(path):
+    '''Moves a directory out of the way and deletes it on a background thread.
+
+    The rename is a single operation, so path can be reused immediately while
+    the files are unlinked. Returns the thread removing the directory.
+    '''
+    path = os.path.abspath(path)
+    trash = os.path.join(os.path.dirname(path),
+                         f'.{os.path.basename(path)}.{uuid.uuid4().hex}')
+    os.rename(path, trash)
+    thread = threading.Thread(target=shutil.rmtree, args=(trash,),
+                              kwargs={'ignore_errors': True})
+    thread.start()
+    return thread
+
+
+def remove_stale_dirs(path):
+    '''Deletes directories moved aside by remove_dir_in_background() for path
+    that were left behind because the process exited before the background
+    thread finished removing them.
+    '''
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    if not os.path.isdir(parent):
+        return
+
+    stale_dir = re.compile(rf'\.{re.escape(os.path.basename(path))}\.[0-9a-f]{{32}}')
+    for name in os.listdir(parent):
+        if stale_dir.fullmatch(name):
+            shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+
+
 def terminate_process(pid, timeout=3):
     '''Terminates a process and all its (grand+)children.
 
@@ -197,5 +231,6 @@ def get_file_template(path, root=os.path.join(PACKAGE_ROOT, 'templates')):
         root = os.path.dirname(path)
         path = os.path.basename(path)
 
+    from jinja2 import Environment, FileSystemLoader
     env = Environment(loader=FileSystemLoader(root))
     return env.get_template(path)
@@ -0,0 +1,33 @@
+import os
+import uuid
+
+import siliconcompiler
+
+from siliconcompiler.tools.builtin import nop
+
+
+def _removed_job_dirs(chip):
+    jobname = chip.get('option', 'jobname')
+    return [name for name in os.listdir(os.path.dirname(chip._getworkdir()))
+            if name.startswith(f'.{jobname}.')]
+
+
+def test_clean_build_dir():
+    chip = siliconcompiler.Chip('test')
+    flow = 'test'
+    chip.set('option', 'flow', flow)
+    chip.set('option', 'mode', 'asic')
+    chip.node(flow, 'import', nop)
+
+    chip.run()
+    stale_file = os.path.join(chip._getworkdir(), 'stale.txt')
+    with open(stale_file, 'w') as f:
+        f.write('stale')
+
+    # Directory left behind by a run that exited before removing it
+    stale_dir = os.path.join(os.path.dirname(chip._getworkdir()), f'.job0.{uuid.uuid4().hex}')
+    os.makedirs(os.path.join(stale_dir, 'import'))
+
+    chip.run()
+    assert not os.path.exists(stale_file)
+    assert _removed_job_dirs(chip) == []
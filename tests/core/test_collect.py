@@ -29,6 +29,20 @@ def test_collect_file_update():
         assert f.readline() == 'newfake'
 
 
+def test_collect_multiple_files():
+    chip = siliconcompiler.Chip('fake')
+    for i in range(8):
+        with open(f'fake{i}.v', 'w') as f:
+            f.write(f'fake{i}')
+        chip.input(f'fake{i}.v')
+    chip._collect()
+
+    for i in range(8):
+        filename = chip._get_imported_filename(f'fake{i}.v')
+        with open(os.path.join(chip._getcollectdir(), filename), 'r') as f:
+            assert f.readline() == f'fake{i}'
+
+
 def test_collect_file_asic_demo():
     chip = siliconcompiler.Chip('demo')
     chip.load_target(asic_demo)
@@ -290,3 +290,21 @@ def test_invalid_switch():
     chip = siliconcompiler.Chip('test_chip')
     with pytest.raises(siliconcompiler.SiliconCompilerError):
         chip.create_cmdline('testing', switchlist=['-loglevel', '-var', '-abcd'])
+
+
+def test_preprocess_keys_mutation(monkeypatch):
+    '''
+    Ensure a preprocess_keys callback that modifies its keypath does not
+    affect later calls to create_cmdline
+    '''
+    def preprocess_keys(keypath, item):
+        keypath.clear()
+        return item
+
+    schema = siliconcompiler.Chip('test').schema
+    monkeypatch.setattr('sys.argv', ['sc', '-jobname', 'foo'])
+    schema.create_cmdline('sc', switchlist=['-jobname'], preprocess_keys=preprocess_keys)
+    assert schema.get('option', 'jobname') == 'foo'
+
+    chip = do_cli_test(['sc', '-jobname', 'bar'], monkeypatch, switchlist=['-jobname'])
+    assert chip.get('option', 'jobname') == 'bar'
@@ -1,4 +1,5 @@
 # Copyright 2020 Silicon Compiler Authors. All Rights Reserved.
+import hashlib
 import pytest
 
 import siliconcompiler
@@ -55,13 +56,33 @@ def test_err_mismatch():
         ['aec070645fe53ee3b3763059376134f058cc337247c978add178b6ccdfb0019f']
 
 
+def test_hash_multiple_files():
+    chip = siliconcompiler.Chip('top')
+
+    # Necessary due to find_files() quirk, we need a flow w/ an import step
+    chip.load_target('freepdk45_demo')
+
+    expected = []
+    for n in range(8):
+        with open(f'foo{n}.txt', 'w', newline='\n') as f:
+            f.write(f'foobar{n}\n' * (n + 1) * 1000)
+        chip.add('input', 'rtl', 'verilog', f'foo{n}.txt')
+        with open(f'foo{n}.txt', 'rb') as f:
+            expected.append(hashlib.sha256(f.read()).hexdigest())
+
+    # Hashes must be reported in the same order as the files
+    assert chip.hash_files('input', 'rtl', 'verilog') == expected
+
+
 @pytest.mark.parametrize('algorithm,expected', [
     ('md5', '14758f1afd44c09b7992073ccf00b43d'),
     ('sha1', '988881adc9fc3655077dc2d4d757d480b5ea0e11'),
     ('sha224', '90a81bdaa85b5d9dfc4c0cd89d9edaf93255d5f4160cd67bead46a91'),
     ('sha256', 'aec070645fe53ee3b3763059376134f058cc337247c978add178b6ccdfb0019f'),
     ('sha384', '190d8045dc5875c1004e4dd31f13194eea25043cf9ffc40550cca30fdcae20f8d7eed05f3c94058b206329dbe8d2312e'),  # noqa E501
-    ('sha512', 'e79b8ad22b34a54be999f4eadde2ee895c208d4b3d83f1954b61255d2556a8b73773c0dc0210aa044ffcca6834839460959cbc9f73d3079262fc8bc935d46262')])  # noqa E501
+    ('sha512', 'e79b8ad22b34a54be999f4eadde2ee895c208d4b3d83f1954b61255d2556a8b73773c0dc0210aa044ffcca6834839460959cbc9f73d3079262fc8bc935d46262'),  # noqa E501
+    ('blake2b', '9e2bf63e933e610efee4a8d6cd4a9387e80860edee97e27db3b37a828d226ab1eb92a9cdd8ca9ca67a753edaf8bd89a0558496f67a30af6f766943839acf0110'),  # noqa E501
+    ('blake2s', '2d15424025751d1d2888e0def3e418986097cb4b0be193ac91393ac6d2ea41e1')])
 def test_changed_algorithm(algorithm, expected):
 
     # Create foo.txt and compute its hash
@@ -78,6 +99,23 @@ def test_changed_algorithm(algorithm, expected):
     assert chip.hash_files('input', 'rtl', 'verilog') == [expected]
 
 
+def test_blake3():
+    pytest.importorskip('blake3')
+
+    # Create foo.txt and compute its hash
+    with open('foo.txt', 'w', newline='\n') as f:
+        f.write('foobar\n')
+
+    chip = siliconcompiler.Chip('top')
+
+    # Necessary due to find_files() quirk, we need a flow w/ an import step
+    chip.load_target('freepdk45_demo')
+    chip.set('input', 'rtl', 'verilog', 'foo.txt')
+    chip.set('input', 'rtl', 'verilog', 'blake3', field='hashalgo')
+    assert chip.hash_files('input', 'rtl', 'verilog') == \
+        ['534659321d2eea6b13aea4f4c94c3b4f624622295da31506722b47a8eb9d726c']
+
+
 #########################
 if __name__ == "__main__":
     test_changed_algorithm('md5')
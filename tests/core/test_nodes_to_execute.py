@@ -360,3 +360,31 @@ def test_nodes_to_execute_different_flow_from_to():
         ('G', '0'),
         ('H', '0')
     ]
+
+
+def test_nodes_to_execute_wide_fork_join():
+    '''
+    Check that repeated fork/join stages do not blow up path enumeration
+    A -- B0..7 -- C -- D0..7 -- E -- ...
+    '''
+    chip = siliconcompiler.Chip('test')
+    flow = 'test'
+
+    prev = None
+    expected = []
+    for stage in range(10):
+        fork = f'fork{stage}'
+        merge = f'join{stage}'
+        chip.node(flow, merge, join)
+        for index in range(8):
+            chip.node(flow, fork, nop, index=index)
+            chip.edge(flow, fork, merge, tail_index=index)
+            if prev:
+                chip.edge(flow, prev, fork, head_index=index)
+        prev = merge
+        expected.extend([(fork, str(index)) for index in range(8)])
+        expected.append((merge, '0'))
+
+    chip.set('option', 'flow', flow)
+
+    assert set(chip.nodes_to_execute()) == set(expected)
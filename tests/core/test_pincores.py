@@ -0,0 +1,112 @@
+# Copyright 2024 Silicon Compiler Authors. All Rights Reserved.
+import multiprocessing.connection
+import os
+
+import pytest
+
+import siliconcompiler
+from siliconcompiler import NodeStatus
+
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'),
+                                reason='Core pinning requires os.sched_setaffinity')
+
+
+class FakeProcess:
+    def __init__(self, pid):
+        self.pid = pid
+        self.sentinel = pid
+        self.exitcode = None
+        self.alive = False
+
+    def start(self):
+        self.alive = True
+
+    def join(self):
+        pass
+
+    def is_alive(self):
+        return self.alive
+
+
+@pytest.fixture
+def pinned(monkeypatch):
+    pinned = {}
+
+    def sched_setaffinity(pid, cores):
+        pinned[pid] = list(cores)
+
+    monkeypatch.setattr(os, 'sched_getaffinity', lambda pid: {0, 1, 2, 3})
+    monkeypatch.setattr(os, 'sched_setaffinity', sched_setaffinity)
+    return pinned
+
+
+def _run(chip, pinned, monkeypatch, threads=None):
+    '''
+    Runs a and b in parallel and c after a through _launch_nodes, where the
+    running process with the lowest pid finishes first. Each node uses two
+    threads unless overridden in threads.
+    '''
+    if threads is None:
+        threads = {}
+
+    flow = 'test'
+    for step in ('a', 'b', 'c'):
+        chip.set('flowgraph', flow, step, '0', 'tool', 'yosys')
+        chip.set('flowgraph', flow, step, '0', 'task', 'syn_asic')
+        chip.set('tool', 'yosys', 'task', 'syn_asic', 'threads', threads.get(step, 2),
+                 step=step, index='0')
+
+    nodes_to_run = {('a', '0'): [], ('b', '0'): [], ('c', '0'): [('a', '0')]}
+    processes = {node: FakeProcess(pid) for pid, node in enumerate(nodes_to_run, start=1)}
+    status = {node: NodeStatus.PENDING for node in nodes_to_run}
+
+    # Cores held by the other running nodes whenever a node is pinned
+    held = {}
+
+    def wait(sentinels):
+        running = [processes[node] for node in processes if processes[node].alive]
+        for proc in running:
+            if proc.pid in pinned:
+                held[proc.pid] = {core for other in running if other is not proc
+                                  for core in pinned.get(other.pid, [])}
+        proc = min(running, key=lambda proc: proc.pid)
+        proc.alive = False
+        proc.exitcode = 0
+        return [proc.sentinel]
+
+    monkeypatch.setattr(multiprocessing.connection, 'wait', wait)
+    chip._launch_nodes(nodes_to_run, processes, flow, status)
+
+    assert all(state == NodeStatus.SUCCESS for state in status.values())
+    return held
+
+
+def test_pincores(pinned, monkeypatch):
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'pincores', True)
+
+    held = _run(chip, pinned, monkeypatch)
+
+    # a and b split the cores, and c reuses the cores a gave back
+    assert pinned == {1: [0, 1], 2: [2, 3], 3: [0, 1]}
+    for pid, cores in pinned.items():
+        assert not held[pid].intersection(cores)
+
+
+def test_pincores_too_many_threads(pinned, monkeypatch):
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'pincores', True)
+
+    _run(chip, pinned, monkeypatch, threads={'b': 3})
+
+    # b does not fit next to a and is left unpinned
+    assert pinned == {1: [0, 1], 3: [0, 1]}
+
+
+def test_pincores_disabled(pinned, monkeypatch):
+    chip = siliconcompiler.Chip('test')
+
+    _run(chip, pinned, monkeypatch)
+
+    assert pinned == {}
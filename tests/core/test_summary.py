@@ -10,6 +10,8 @@ from siliconcompiler.tools.openroad import cts
 from siliconcompiler.tools.builtin import nop
 from siliconcompiler.tools.builtin import minimum
 
+from siliconcompiler.report.summary_table import _format_table
+
 
 @pytest.fixture
 def gcd_with_metrics(gcd_chip):
@@ -90,3 +92,18 @@ def test_parallel_path(capfd):
     assert 'cts0' not in stdout
     assert 'place2' not in stdout
     assert 'cts2' not in stdout
+
+
+def test_format_table():
+    row_labels = ['cellarea', 'registers', 'a_very_long_metric_name']
+    column_labels = ['units', '  syn0  ', 'a_wide_column_label0']
+    # Cells are padded the same way _show_summary_table pads them
+    data = [['um^2', '   12.5  ', '   ---   '],
+            ['', '    4    ', ' 1000000 '],
+            ['ns', '         ', '    7    ']]
+
+    assert _format_table(row_labels, column_labels, data) == '\n'.join([
+        '                        units     syn0   a_wide_column_label0',
+        'cellarea                 um^2     12.5                 ---   ',
+        'registers                          4                 1000000 ',
+        'a_very_long_metric_name    ns                           7    '])
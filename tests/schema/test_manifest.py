@@ -1,3 +1,5 @@
+import json
+import math
 import pathlib
 import pytest
 
@@ -42,3 +44,50 @@ def test_read_manifest_with_disallow_missing_keys():
     schema2 = Schema()
     with pytest.raises(ValueError):
         schema2.read_manifest('tmp.json', allow_missing_keys=False)
+
+
+@pytest.mark.parametrize('has_orjson', [True, False])
+def test_manifest_json_writer(monkeypatch, has_orjson):
+    if has_orjson:
+        pytest.importorskip('orjson')
+    monkeypatch.setattr('siliconcompiler.schema.schema_obj._has_orjson', has_orjson)
+
+    schema = Schema()
+
+    schema.set('input', 'rtl', 'verilog', ['foo.v', 'C:\\Users\\Zo\u00eb\\\u2713.v'])
+    schema.set('constraint', 'outline', [(0, 0), (100.13, 100.8)])
+    schema.set('metric', 'totalarea', 1e22, step='syn', index='0')
+    schema.set('metric', 'cellarea', 1.5e-05, step='syn', index='0')
+    # Non-ASCII values are escaped, so any locale encoding can write them
+    with open('tmp.json', 'w', encoding='cp1252') as f:
+        schema.write_json(f)
+
+    schema2 = Schema(manifest='tmp.json')
+    assert schema2.get('input', 'rtl', 'verilog') == ['foo.v', 'C:\\Users\\Zo\u00eb\\\u2713.v']
+    assert schema2.get('constraint', 'outline') == [(0, 0), (100.13, 100.8)]
+    assert schema2.get('metric', 'totalarea', step='syn', index='0') == 1e22
+    assert schema2.get('metric', 'cellarea', step='syn', index='0') == 1.5e-05
+
+    # Written the same way with and without orjson
+    with open('tmp.json', encoding='cp1252') as f:
+        assert f.read() == json.dumps(schema.cfg, indent=4)
+
+
+@pytest.mark.parametrize('has_orjson', [True, False])
+def test_manifest_json_writer_nonfinite(monkeypatch, has_orjson):
+    if has_orjson:
+        pytest.importorskip('orjson')
+    monkeypatch.setattr('siliconcompiler.schema.schema_obj._has_orjson', has_orjson)
+
+    schema = Schema()
+
+    schema.set('metric', 'setupslack', float('inf'), step='syn', index='0')
+    schema.set('metric', 'holdslack', float('-inf'), step='syn', index='0')
+    schema.set('metric', 'totalarea', float('nan'), step='syn', index='0')
+    with open('tmp.json', 'w') as f:
+        schema.write_json(f)
+
+    schema2 = Schema(manifest='tmp.json')
+    assert schema2.get('metric', 'setupslack', step='syn', index='0') == float('inf')
+    assert schema2.get('metric', 'holdslack', step='syn', index='0') == float('-inf')
+    assert math.isnan(schema2.get('metric', 'totalarea', step='syn', index='0'))
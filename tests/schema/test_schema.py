@@ -96,3 +96,20 @@ def test_list_of_tuples():
     # for a list type
     schema.set(*keypath, ['import', '0'])
     assert schema.get(*keypath) == expected
+
+
+def test_copy_pruned():
+    schema = Schema()
+    schema.set('option', 'param', 'N', '64')
+    schema.set('tool', 'yosys', 'task', 'syn', 'var', 'a', 'b', step='syn', index='0')
+
+    expected = schema.copy()
+    expected.prune()
+
+    pruned = schema._copy_pruned()
+    assert pruned.cfg == expected.cfg
+    assert 'default' not in pruned.cfg['option']['param']
+
+    # copy must not alias the original
+    pruned.set('option', 'param', 'N', '32')
+    assert schema.get('option', 'param', 'N') == '64'